@@ -1,4 +1,3 @@
-import time
 from dataclasses import dataclass
 from enum import Enum, IntEnum, IntFlag, auto
 
@@ -15,6 +14,8 @@ from pyreg import (
     RegRw,
     logger,
 )
+from pyreg.probe import probed
+from pyreg.reg import RegFlagError
 
 
 class CryptoEvent(IntEnum):
@@ -25,30 +26,29 @@ class CryptoEvent(IntEnum):
     HOST_ECDH_RDY    = 3 # host's ecdh public key is ready
     # fmt: on
 
+    @probed("trigger")
     def trigger(self):
-        CryptoReg.GLB_CONFIG0.value.EVENT_ID = self
-        CryptoReg.GLB_CONFIG0.value.EVENT_TRIG.trigger()
+        with CryptoReg.GLB_CONFIG0.value.batch() as reg:
+            reg.EVENT_ID = self
+            reg.EVENT_TRIG.trigger()
 
         # CryptoReg.GLB_CONFIG0.value.write(event, [6, 7], set_mask=Bit._5)
         # CryptoReg.GLB_CONFIG0.value.write(clear_mask=Bit._5)
 
-        is_done = False
-        for _ in range(100):
-            state = CryptoReg.CRYPTO_STATE.value.flags()
-            if CryptoState.EVENT_DONE in state:
-                if CryptoState.EVENT_STATUS not in state:
-                    is_done = True
-                    break
-                logger.error(f"Trigger Event {self.name} Error")
-                raise RuntimeError
-
-            time.sleep(0.05)
-
-        if is_done:
-            logger.debug(f"Trigger Event {self.name} Done")
-        else:
+        try:
+            elapsed = CryptoReg.CRYPTO_STATE.value.wait_for(
+                set=CryptoState.EVENT_DONE,
+                error=CryptoState.EVENT_STATUS,
+                error_when_done=True,
+            )
+        except RegFlagError as e:
+            logger.error(f"Trigger Event {self.name} Error")
+            raise RuntimeError from e
+        except TimeoutError:
             logger.error(f"Trigger Event {self.name} TIMEOUT")
-            raise TimeoutError
+            raise
+
+        logger.debug(f"Trigger Event {self.name} Done in {elapsed:.3f}s")
 
 
 @dataclass
@@ -126,8 +126,8 @@ class CryptoReg(Enum):
     FAULT_PARAM           = RegRw(0x1A3C)
     IV0                   = RegRw(0x1A40, size=12)
     DUMMY_REQ             = RegRw(0x1A4C)
-    FAULT_LATCH           = RegRw(0x1A50)
-    STICKY_FAULT          = RegRw(0x1A54)
+    FAULT_LATCH           = RegRw(0x1A50, volatile=True)
+    STICKY_FAULT          = RegRw(0x1A54, volatile=True)
     RSV_2                 = RegRw(0x1A58)
     GMAC0                 = RegRo(0x1A5C)
     GMAC1                 = RegRo(0x1A60)
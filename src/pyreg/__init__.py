@@ -1,6 +1,7 @@
 # noqa: N999
 from . import utils
 from .bit import Bit, Bits, Byte, Bytes
+from .cache import Shadow
 from .device import IptDevice
 from .endian import Endian
 from .field import BitBool, BitEnum, BitField, BitRsvd, BitTrigger
@@ -37,6 +38,7 @@ __all__ = [
     "BitTrigger",
     "RegFlags",
     "RegRsvd",
+    "Shadow",
     "logger",
     "utils",
 ]
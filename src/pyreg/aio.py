@@ -0,0 +1,194 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, ClassVar, Self
+from weakref import WeakKeyDictionary
+
+from .device import Device
+from .endian import ByteT
+from .field import FieldProperty, TrgProperty, reg_fields
+from .log import logger
+from .mask import BitMask, BitT, Mask
+from .reg import Reg
+
+
+@dataclass
+class AsyncDevice(ABC):
+    name: str
+    _locks: dict[int, asyncio.Lock] = field(
+        default_factory=dict[int, asyncio.Lock], init=False, repr=False
+    )
+
+    def reg_lock(self, addr: int) -> asyncio.Lock:
+        lock = self._locks.get(addr)
+        if lock is None:
+            lock = self._locks[addr] = asyncio.Lock()
+        return lock
+
+    @abstractmethod
+    async def read(self, addr: int, size: int) -> bytes: ...
+
+    @abstractmethod
+    async def write(self, addr: int, val: ByteT) -> None: ...
+
+    async def burst_read(self, addr: int, size: int) -> bytes:
+        return await self.read(addr, size)
+
+    async def burst_write(self, addr: int, vals: ByteT) -> None:
+        return await self.write(addr, vals)
+
+    async def barrier(self) -> None:
+        return None
+
+
+@dataclass
+class ExecutorDevice(AsyncDevice):
+    name: str = ""
+    device: Device = field(kw_only=True)
+    executor: Executor | None = field(default=None, kw_only=True)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, kw_only=True)
+
+    wrapped: ClassVar[
+        WeakKeyDictionary[asyncio.AbstractEventLoop, dict[int, "ExecutorDevice"]]
+    ] = WeakKeyDictionary()
+
+    def __post_init__(self) -> None:
+        self.name = self.name or self.device.name
+
+    @classmethod
+    def of(cls, device: Device) -> "ExecutorDevice":
+        wrapped = cls.wrapped.setdefault(asyncio.get_running_loop(), {})
+        if id(device) not in wrapped:
+            wrapped[id(device)] = cls(device=device)
+        return wrapped[id(device)]
+
+    async def run[R](self, func: Callable[..., R], *args: Any) -> R:
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    async def read(self, addr: int, size: int) -> bytes:
+        return await self.run(self.device.read, addr, size)
+
+    async def write(self, addr: int, val: ByteT) -> None:
+        return await self.run(self.device.write, addr, val)
+
+    async def burst_read(self, addr: int, size: int) -> bytes:
+        return await self.run(self.device.burst_read, addr, size)
+
+    async def burst_write(self, addr: int, vals: ByteT) -> None:
+        return await self.run(self.device.burst_write, addr, vals)
+
+    async def barrier(self) -> None:
+        return await self.run(self.device.barrier)
+
+
+@dataclass
+class AsyncReg:
+    reg: Reg
+    device: AsyncDevice
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        return self.device.reg_lock(self.reg.addr)
+
+    @classmethod
+    def of(cls, reg: Reg, device: AsyncDevice | None = None) -> Self:
+        return cls(reg, device or ExecutorDevice.of(reg.device))
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[Reg]:
+        async with self.lock:
+            while not self.reg._lock.acquire(blocking=False):
+                await asyncio.sleep(0.0005)
+            try:
+                yield self.reg
+            finally:
+                self.reg._lock.release()
+
+    async def commit(self, val: int) -> None:
+        reg = self.reg
+        b = reg.endian.int_to_bytes(val, reg.size)
+        await self.device.write(reg.addr, b)
+        if (shadow := reg.shadow) is not None:
+            shadow.put(reg.addr, b)
+
+    async def read(self, bit: BitT | BitMask | None = None) -> int:
+        reg = self.reg
+        reg.check_read()
+        b = await self.device.read(reg.addr, reg.size)
+        if (shadow := reg.shadow) is not None:
+            shadow.put(reg.addr, b)
+        val = reg.endian.bytes_to_int(b)
+        if bit is not None:
+            val = BitMask.of(bit).get_field(val)
+        logger.trace("Read Reg: {:#10x} {:#04x}", reg.addr, val)
+        return val
+
+    async def write(self, val: int = 0) -> None:
+        reg = self.reg
+        reg.check_write()
+        async with self.hold():
+            logger.trace("Write Reg {:#010x}: {:#04x}", reg.addr, val)
+            await self.commit(val)
+
+    async def modify(
+        self,
+        val: int = 0,
+        bit: BitT | BitMask | None = None,
+        set_mask: int | None = None,
+        clear_mask: int | None = None,
+    ) -> None:
+        reg = self.reg
+        reg.check_read()
+        reg.check_write()
+        async with self.hold():
+            rv = await self.read()
+            if bit is not None:
+                rv = BitMask.of(bit).set_field(rv, val)
+            if set_mask is not None:
+                rv = Mask(set_mask).set(rv)
+            if clear_mask is not None:
+                rv = Mask(clear_mask).clear(rv)
+            logger.trace("Modify Reg {:#010x}: {:#04x}", reg.addr, rv)
+            await self.commit(rv)
+
+    async def read_bytes(self, size: int | None = None) -> bytes:
+        reg = self.reg
+        reg.check_read()
+        b = await self.device.burst_read(reg.addr, size or reg.size)
+        if reg.endian.is_big:
+            return reg.endian.bytes_to_bytes(b)
+        return b
+
+    async def write_bytes(self, vals: bytes | bytearray) -> None:
+        assert len(vals) <= self.reg.size
+        async with self.hold():
+            try:
+                await self.device.burst_write(self.reg.addr, vals)
+            finally:
+                self.reg.invalidate()
+
+    def field(self, name: str) -> FieldProperty:
+        prop = reg_fields(self.reg).get(name)
+        if prop is None:
+            raise AttributeError(f"{type(self.reg).__name__} has no field {name}")
+        return prop
+
+    async def get(self, name: str) -> Any:
+        prop = self.field(name)
+        return prop.decode(await self.read(prop))
+
+    async def set(self, name: str, val: Any) -> None:
+        prop = self.field(name)
+        await self.modify(prop.encode(val), prop)
+
+    async def trigger(self, name: str, val: int | None = None) -> None:
+        prop = self.field(name)
+        if not isinstance(prop, TrgProperty):
+            raise AttributeError(f"{name} is not a trigger field")
+        await self.modify(val or getattr(prop, "val", 1), prop)
+        await self.device.barrier()
+        await self.modify(0, prop)
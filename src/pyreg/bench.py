@@ -0,0 +1,164 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+from dataclasses import asdict, dataclass
+from enum import IntEnum, IntFlag
+from pathlib import Path
+from typing import Any, Callable
+
+from .binary import Binary
+from .endian import Endian
+from .field import BitBool, BitEnum, BitField, BitTrigger
+from .reg import RegFlags, RegRw
+from .sim import SimDevice
+from .uint import U32
+
+
+class BenchMode(IntEnum):
+    IDLE = 0
+    RUN = 1
+    HALT = 2
+
+
+class BenchFlag(IntFlag):
+    READY = 1
+    DONE = 2
+    ERROR = 4
+
+
+@dataclass
+class BenchReg(RegRw):
+    FIELD = BitField((0, 8))
+    BOOL = BitBool(8)
+    ENUM = BitEnum[BenchMode]([9, 10])
+    TRIG = BitTrigger(11)
+
+
+@dataclass
+class BenchResult:
+    name: str
+    ns_per_op: float
+    loops: int
+
+
+type Case = tuple[str, Callable[[], Any]]
+
+
+def reg_cases(device: SimDevice) -> list[Case]:
+    reg = BenchReg(0x100, device=device)
+    flags = RegFlags[BenchFlag](0x104, device=device)
+    return [
+        ("reg.read", lambda: reg.read()),
+        ("reg.read.bit", lambda: reg.read((0, 8))),
+        ("reg.write", lambda: reg.write(0x1234)),
+        ("reg.modify", lambda: reg.modify(0x5A, (0, 8))),
+        ("reg.check", lambda: reg.check((0, 8))),
+        ("field.get", lambda: reg.FIELD),
+        ("field.set", lambda: setattr(reg, "FIELD", 0x5A)),
+        ("bool.get", lambda: reg.BOOL),
+        ("bool.set", lambda: setattr(reg, "BOOL", True)),
+        ("enum.get", lambda: reg.ENUM),
+        ("enum.set", lambda: setattr(reg, "ENUM", BenchMode.RUN)),
+        ("trigger", lambda: reg.TRIG.trigger()),
+        ("flags", lambda: flags.flags()),
+    ]
+
+
+def value_cases() -> list[Case]:
+    b = bytes(range(4))
+    u = U32(0x12345678)
+    return [
+        ("endian.bytes_to_int", lambda: Endian.LITTLE.bytes_to_int(b)),
+        ("endian.int_to_bytes", lambda: Endian.BIG.int_to_bytes(0x12345678)),
+        ("endian.int_to_int", lambda: Endian.BIG.int_to_int(0x12345678)),
+        ("uint.bit", lambda: u[3]),
+        ("uint.slice", lambda: u[:16]),
+        ("uint.reverse", lambda: u[::-1]),
+    ]
+
+
+def binary_cases(tmp: Path, sizes: list[int]) -> list[Case]:
+    file = tmp.joinpath("bench.bin")
+    file.write_bytes(bytes(max(sizes) * 4))
+    cases: list[Case] = []
+    for mapped in (False, True):
+        b = Binary(file, mapped=mapped)
+        b.new()
+        mode = "mapped" if mapped else "raw"
+        for size in sizes:
+            val = bytes(size)
+            cases.append(
+                (f"binary.{mode}.read.{size}", lambda b=b, n=size: b.read(0, n))
+            )
+            cases.append(
+                (f"binary.{mode}.write.{size}", lambda b=b, v=val: b.write(0, v))
+            )
+    return cases
+
+
+def measure(name: str, func: Callable[[], Any], repeat: int) -> BenchResult:
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    times = timer.repeat(repeat=repeat, number=loops)
+    return BenchResult(name, statistics.median(times) / loops * 1e9, loops)
+
+
+def run(
+    latency: float = 0.0, sizes: list[int] | None = None, repeat: int = 5
+) -> list[BenchResult]:
+    sizes = sizes or [4, 256, 4096, 65536]
+    device = SimDevice(latency=latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = reg_cases(device) + value_cases() + binary_cases(Path(tmp), sizes)
+        return [measure(name, func, repeat) for name, func in cases]
+
+
+def compare(
+    results: list[BenchResult], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    regressions: list[str] = []
+    for r in results:
+        base = baseline.get(r.name)
+        if base is not None and r.ns_per_op > base * threshold:
+            regressions.append(f"{r.name}: {base:.0f} -> {r.ns_per_op:.0f} ns/op")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m pyreg.bench")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sizes", type=int, nargs="+")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against results file")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    results = run(args.latency, args.sizes, args.repeat)
+    for r in results:
+        print(f"{r.name:<32} {r.ns_per_op:>12.1f} ns/op")  # noqa: T201
+
+    if args.json:
+        doc = {
+            "python": platform.python_version(),
+            "latency": args.latency,
+            "results": [asdict(r) for r in results],
+        }
+        args.json.write_text(json.dumps(doc, indent=1))
+
+    if args.baseline:
+        doc = json.loads(args.baseline.read_text())
+        baseline = {r["name"]: r["ns_per_op"] for r in doc["results"]}
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")  # noqa: T201
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,51 +1,279 @@
+from bisect import bisect_right
 from dataclasses import dataclass, field
+from mmap import ACCESS_READ, mmap
 from pathlib import Path
+from typing import ClassVar, Iterable, Iterator, Self
 
+from .bit import Bytes
 from .device import Device
 from .endian import ByteT
+from .hex import HexFormat, SegmentT
 from .log import logger
 
 
+@dataclass
+class Segments:
+    starts: list[int] = field(default_factory=list[int])
+    data: list[bytearray] = field(default_factory=list[bytearray])
+    fill: int = 0xFF
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[SegmentT]) -> Self:
+        self = cls()
+        for addr, b in segments:
+            self.write(addr, b)
+        return self
+
+    def __iter__(self) -> Iterator[SegmentT]:
+        for s, d in zip(self.starts, self.data):
+            yield s, bytes(d)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def start(self) -> int:
+        return self.starts[0] if self.starts else 0
+
+    @property
+    def end(self) -> int:
+        return self.starts[-1] + len(self.data[-1]) if self.starts else 0
+
+    def read(self, addr: int, size: int) -> bytes:
+        b = bytearray([self.fill]) * size
+        i = max(bisect_right(self.starts, addr) - 1, 0)
+        while i < len(self.starts) and self.starts[i] < addr + size:
+            s, d = self.starts[i], self.data[i]
+            lo, hi = max(addr, s), min(addr + size, s + len(d))
+            if lo < hi:
+                b[lo - addr : hi - addr] = d[lo - s : hi - s]
+            i += 1
+        return bytes(b)
+
+    def write(self, addr: int, val: ByteT) -> None:
+        val = bytes(val)
+        end = addr + len(val)
+        if self.starts and addr == self.end:
+            self.data[-1] += val
+            return
+
+        i = bisect_right(self.starts, addr) - 1
+        if i < 0 or self.starts[i] + len(self.data[i]) < addr:
+            i += 1
+        j = bisect_right(self.starts, end)
+        if i == j:
+            self.starts.insert(i, addr)
+            self.data.insert(i, bytearray(val))
+            return
+
+        start = min(self.starts[i], addr)
+        b = bytearray(max(self.starts[j - 1] + len(self.data[j - 1]), end) - start)
+        for s, d in zip(self.starts[i:j], self.data[i:j]):
+            b[s - start : s - start + len(d)] = d
+        b[addr - start : end - start] = val
+        self.starts[i:j] = [start]
+        self.data[i:j] = [b]
+
+
 @dataclass
 class Binary(Device):
+    PAGE: ClassVar[int] = Bytes._4K
+
     file: Path
     offset: int = 0
 
-    bin: bytes = field(init=False)
+    bin: bytes | memoryview = field(init=False)
 
     new_file: Path = field(init=False)
-    new_bin: bytearray = field(init=False)
+    new_bin: bytearray | None = field(init=False, default=None)
 
-    def __init__(self, file: Path | None = None) -> None:
+    pages: dict[int, bytearray] | None = field(init=False, default=None)
+    map: mmap | None = field(init=False, default=None)
+    segments: Segments | None = field(init=False, default=None)
+    dirty: list[tuple[int, int]] = field(
+        init=False, default_factory=list[tuple[int, int]]
+    )
+
+    def __init__(self, file: Path | None = None, mapped: bool = False) -> None:
+        self.dirty = []
         if file is None:
             logger.warning("Binary file is not specified.")
             return
-        self.load(file)
+        self.load(file, mapped)
+
+    @property
+    def is_mapped(self) -> bool:
+        return self.pages is not None
 
-    def load(self, file: Path) -> None:
+    def load(self, file: Path, mapped: bool = False) -> None:
+        self.close()
         self.file = file
+        self.segments = None
+        self.new_bin = None
+        if (fmt := HexFormat.of(file)) is not None:
+            with file.open(mode="r") as fp:
+                self.segments = Segments.from_segments(fmt.parse(fp))
+            return
         with file.open(mode="rb") as fp:
-            self.bin = fp.read()
+            if not mapped:
+                self.bin = fp.read()
+                return
+            self.map = mmap(fp.fileno(), 0, access=ACCESS_READ)
+        self.bin = memoryview(self.map)
+        self.pages = {}
+
+    def close(self) -> None:
+        if self.map is None:
+            return
+        if isinstance(self.bin, memoryview):
+            self.bin.release()
+        self.map.close()
+        self.map = None
+        self.pages = None
+
+    @property
+    def working(self) -> bytes | bytearray | memoryview:
+        return self.bin if self.new_bin is None else self.new_bin
 
     def new(self) -> None:
+        self.dirty = []
+        if self.segments is not None:
+            return
+        if self.pages is not None:
+            self.pages = {}
+            return
         self.new_bin = bytearray(self.bin)
 
-    def save(self, new_file: Path) -> None:
+    def mark_dirty(self, s: int, e: int) -> None:
+        if self.dirty and s <= self.dirty[-1][1] and self.dirty[-1][0] <= e:
+            last = self.dirty[-1]
+            self.dirty[-1] = min(last[0], s), max(last[1], e)
+        else:
+            self.dirty.append((s, e))
+
+    def extents(self) -> list[tuple[int, int]]:
+        merged: list[tuple[int, int]] = []
+        for s, e in sorted(self.dirty):
+            if merged and s <= merged[-1][1]:
+                merged[-1] = merged[-1][0], max(merged[-1][1], e)
+            else:
+                merged.append((s, e))
+        self.dirty = merged
+        return [(s, e - s) for s, e in merged]
+
+    def save(self, new_file: Path | None = None) -> None:
+        if self.segments is not None:
+            return self.save_segments(new_file or self.file)
+        if new_file is None or self.is_file(new_file):
+            return self.save_dirty()
+
         with new_file.open(mode="wb") as fp:
-            fp.write(self.new_bin)
+            if self.pages is None:
+                fp.write(self.working)
+                return
+            pos = 0
+            for p in sorted(self.pages):
+                fp.write(self.bin[pos : p * self.PAGE])
+                fp.write(self.pages[p])
+                pos = p * self.PAGE + len(self.pages[p])
+            fp.write(self.bin[pos:])
+
+    def is_file(self, file: Path) -> bool:
+        if file == self.file:
+            return True
+        return file.exists() and self.file.exists() and file.samefile(self.file)
+
+    def save_segments(self, new_file: Path) -> None:
+        assert self.segments is not None
+        fmt = HexFormat.of(new_file)
+        if fmt is not None:
+            with new_file.open(mode="w") as fp:
+                fp.writelines(f"{line}\n" for line in fmt.dump(self.segments))
+        else:
+            with new_file.open(mode="wb") as fp:
+                pos = self.segments.start
+                for s, d in self.segments:
+                    fp.write(bytes([self.segments.fill]) * (s - pos))
+                    fp.write(d)
+                    pos = s + len(d)
+        self.dirty = []
+
+    def save_dirty(self) -> None:
+        with self.file.open(mode="r+b") as fp:
+            for pos, size in self.extents():
+                fp.seek(pos)
+                fp.write(self.view(pos - self.offset, size, new=True))
+        self.dirty = []
+        if self.pages is not None:
+            self.pages = {}
+
+    def page_range(self, pos: int, size: int) -> range:
+        return range(pos // self.PAGE, (pos + size - 1) // self.PAGE + 1)
+
+    def view(self, addr: int, size: int, new: bool = False) -> memoryview:
+        pos = self.offset + addr
+        if self.segments is not None:
+            return memoryview(self.segments.read(pos, size))
+        if self.pages is None:
+            return memoryview(self.working)[pos : pos + size]
+
+        pages = self.page_range(pos, size)
+        if not any(p in self.pages for p in pages):
+            return memoryview(self.bin)[pos : pos + size]
+
+        b = bytearray(size)
+        for p in pages:
+            lo = max(pos, p * self.PAGE)
+            hi = min(pos + size, (p + 1) * self.PAGE)
+            page = self.pages.get(p)
+            if page is None:
+                b[lo - pos : hi - pos] = self.bin[lo:hi]
+            else:
+                b[lo - pos : hi - pos] = page[lo - p * self.PAGE : hi - p * self.PAGE]
+        return memoryview(b)
+
+    def write_pages(self, pos: int, val: bytes) -> None:
+        assert self.pages is not None
+        for p in self.page_range(pos, len(val)):
+            page = self.pages.get(p)
+            if page is None:
+                page = bytearray(self.bin[p * self.PAGE : (p + 1) * self.PAGE])
+                self.pages[p] = page
+            lo = max(pos, p * self.PAGE)
+            hi = min(pos + len(val), (p + 1) * self.PAGE)
+            page[lo - p * self.PAGE : hi - p * self.PAGE] = val[lo - pos : hi - pos]
 
     def read(self, addr: int, size: int) -> bytes:
-        b = self.bin[self.offset + addr : self.offset + addr + size]
-        return b
+        if self.segments is not None:
+            return self.segments.read(self.offset + addr, size)
+        if self.pages is not None:
+            return bytes(self.view(addr, size))
+        return bytes(self.working[self.offset + addr : self.offset + addr + size])
 
     def write(self, addr: int, val: ByteT) -> None:
-        for i in range(len(val)):
-            self.new_bin[self.offset + addr + i] = val[i]
+        pos = self.offset + addr
+        if self.segments is None and pos + len(val) > len(self.bin):
+            raise IndexError(f"Write out of range: {pos:#x}+{len(val)}")
+        self.mark_dirty(pos, pos + len(val))
+        if self.segments is not None:
+            return self.segments.write(pos, val)
+        if self.pages is not None:
+            return self.write_pages(pos, bytes(val))
+        if self.new_bin is None:
+            self.new_bin = bytearray(self.bin)
+        self.new_bin[pos : pos + len(val)] = bytes(val)
 
     def burst_read(self, addr: int, size: int) -> bytes:
-        b = self.bin[self.offset + addr : self.offset + addr + size]
-        return bytes(b)
+        if self.segments is not None:
+            return self.segments.read(self.offset + addr, size)
+        if self.pages is not None:
+            return bytes(self.view(addr, size))
+        return bytes(self.working[self.offset + addr : self.offset + addr + size])
 
     def burst_write(self, addr: int, vals: ByteT) -> None:
-        for i, v in enumerate(vals):
-            self.new_bin[self.offset + addr + i] = v
+        return self.write(addr, vals)
+
+    def readinto(self, addr: int, buf: bytearray | memoryview) -> int:
+        n = len(buf)
+        buf[:] = self.view(addr, n)
+        return n
@@ -0,0 +1,36 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from .bus import BusManager, buses
+from .device import Device
+from .log import logger
+
+
+@dataclass
+class Result[R]:
+    device: Device
+    value: R | None = None
+    error: Exception | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def broadcast[R](
+    func: Callable[[Device], R],
+    devices: Iterable[Device],
+    manager: BusManager | None = None,
+) -> list[Result[R]]:
+    def job(device: Device) -> Result[R]:
+        start = time.perf_counter()
+        try:
+            value = func(device)
+        except Exception as e:
+            logger.error(f"Broadcast to {device.name} failed: {e!r}")
+            return Result(device, error=e, elapsed=time.perf_counter() - start)
+        return Result(device, value, elapsed=time.perf_counter() - start)
+
+    return (manager or buses).map(job, devices)
@@ -0,0 +1,100 @@
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from .log import logger
+
+if TYPE_CHECKING:
+    from .device import Device
+
+
+@dataclass
+class Bus:
+    name: str
+    opener: Callable[[], Any]
+    closer: Callable[[Any], None] | None = None
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    _handle: Any = field(default=None, repr=False)
+
+    @property
+    def is_open(self) -> bool:
+        return self._handle is not None
+
+    @property
+    def handle(self) -> Any:
+        with self.lock:
+            if self._handle is None:
+                logger.debug(f"Open bus {self.name}")
+                self._handle = self.opener()
+            return self._handle
+
+    def close(self) -> None:
+        with self.lock:
+            if self._handle is None:
+                return
+            if self.closer is not None:
+                self.closer(self._handle)
+            self._handle = None
+
+
+def bus_of(device: Any) -> Bus | None:
+    while device is not None:
+        if (bus := getattr(device, "bus", None)) is not None:
+            return bus
+        device = getattr(device, "device", None)
+    return None
+
+
+@dataclass
+class BusManager:
+    buses: dict[str, Bus] = field(default_factory=dict[str, Bus])
+    max_workers: int | None = None
+
+    def register(
+        self,
+        name: str,
+        opener: Callable[[], Any],
+        closer: Callable[[Any], None] | None = None,
+    ) -> Bus:
+        if name in self.buses:
+            raise ValueError(f"Bus {name} already registered")
+        bus = Bus(name, opener, closer)
+        self.buses[name] = bus
+        return bus
+
+    def get(self, name: str) -> Bus:
+        return self.buses[name]
+
+    def close(self) -> None:
+        for bus in self.buses.values():
+            bus.close()
+
+    def run[R](self, jobs: dict[str, Callable[[], R]]) -> dict[str, R]:
+        with ThreadPoolExecutor(self.max_workers or len(jobs) or 1) as pool:
+            futures = {name: pool.submit(jobs[name]) for name in jobs}
+            return {name: f.result() for name, f in futures.items()}
+
+    def map[D: "Device", R](
+        self, func: Callable[[D], R], devices: Iterable[D]
+    ) -> list[R]:
+        groups: dict[int, list[int]] = defaultdict(list)
+        devices = list(devices)
+        for i, device in enumerate(devices):
+            bus = bus_of(device)
+            groups[id(bus) if bus is not None else id(device)].append(i)
+
+        results: list[Any] = [None] * len(devices)
+
+        def job(indexes: list[int]) -> None:
+            for i in indexes:
+                results[i] = func(devices[i])
+
+        with ThreadPoolExecutor(self.max_workers or len(groups) or 1) as pool:
+            for f in [pool.submit(job, g) for g in groups.values()]:
+                f.result()
+        return results
+
+
+buses = BusManager()
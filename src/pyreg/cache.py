@@ -0,0 +1,44 @@
+import threading
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Shadow:
+    entries: dict[int, bytes] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+    lock: threading.RLock = field(
+        default_factory=threading.RLock, repr=False, compare=False
+    )
+
+    def get(self, addr: int, size: int) -> bytes | None:
+        with self.lock:
+            b = self.entries.get(addr)
+            if b is None or len(b) != size:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return b
+
+    def put(self, addr: int, b: bytes) -> None:
+        with self.lock:
+            self.invalidate(addr, len(b))
+            self.entries[addr] = bytes(b)
+
+    def invalidate(self, addr: int | None = None, size: int = 1) -> None:
+        with self.lock:
+            if addr is None:
+                self.entries.clear()
+                return
+            for a, b in list(self.entries.items()):
+                if a < addr + size and addr < a + len(b):
+                    del self.entries[a]
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Self
+
+from .device import ProxyDevice
+from .endian import ByteT
+from .log import logger
+
+
+def coalesce(pending: dict[int, int]) -> list[tuple[int, bytes]]:
+    runs: list[tuple[int, bytearray]] = []
+    for addr in sorted(pending):
+        if runs and runs[-1][0] + len(runs[-1][1]) == addr:
+            runs[-1][1].append(pending[addr])
+        else:
+            runs.append((addr, bytearray([pending[addr]])))
+    return [(addr, bytes(b)) for addr, b in runs]
+
+
+@dataclass
+class DeferredDevice(ProxyDevice):
+    pending: dict[int, int] = field(default_factory=dict[int, int], init=False)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.flush()
+
+    def is_pending(self, addr: int, size: int) -> bool:
+        if not self.pending:
+            return False
+        return any(a in self.pending for a in range(addr, addr + size))
+
+    def read(self, addr: int, size: int) -> bytes:
+        if self.is_pending(addr, size):
+            self.flush()
+        return self.device.read(addr, size)
+
+    def burst_read(self, addr: int, size: int) -> bytes:
+        if self.is_pending(addr, size):
+            self.flush()
+        return self.device.burst_read(addr, size)
+
+    def write(self, addr: int, val: ByteT) -> None:
+        for i, v in enumerate(val):
+            self.pending[addr + i] = v
+
+    def burst_write(self, addr: int, vals: ByteT) -> None:
+        self.write(addr, vals)
+
+    def barrier(self) -> None:
+        self.flush()
+        self.device.barrier()
+
+    def runs(self) -> list[tuple[int, bytes]]:
+        return coalesce(self.pending)
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        runs = self.runs()
+        self.pending.clear()
+        for addr, b in runs:
+            logger.trace("Flush Write: {:#10x} {} bytes", addr, len(b))
+            self.device.write(addr, b)
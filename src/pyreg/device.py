@@ -1,15 +1,22 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from contextlib import AbstractContextManager
+from dataclasses import KW_ONLY, dataclass, field
 from enum import Enum, IntEnum
-from typing import ClassVar
+from typing import Any, ClassVar, Iterable, Iterator
 
 from .bit import Bits
+from .bus import Bus, buses
+from .cache import Shadow
 from .endian import ByteT
+from .log import logger
+from .probe import probed
 
 
 @dataclass
 class Device(ABC):
     name: str
+    _: KW_ONLY
+    shadow: Shadow | None = None
 
     @abstractmethod
     def read(self, addr: int, size: int) -> bytes: ...
@@ -18,12 +25,40 @@ class Device(ABC):
     def write(self, addr: int, val: ByteT) -> None: ...
 
     def burst_read(self, addr: int, size: int) -> bytes:
-        return b"".join(self.read(addr + i, 1) for i in range(size))
+        b = bytearray(size)
+        for i in range(size):
+            b[i : i + 1] = self.read(addr + i, 1)
+        return bytes(b)
 
     def burst_write(self, addr: int, vals: ByteT) -> None:
         for i in range(len(vals)):
             self.write(addr + i, vals[i : i + 1])
 
+    def readinto(self, addr: int, buf: bytearray | memoryview) -> int:
+        n = len(buf)
+        buf[:] = self.burst_read(addr, n)
+        return n
+
+    def stream(self, addr: int, size: int, chunk: int = 256) -> Iterator[memoryview]:
+        buf = memoryview(bytearray(min(chunk, size)))
+        for i in range(0, size, chunk):
+            view = buf[: min(chunk, size - i)]
+            self.readinto(addr + i, view)
+            yield view
+
+    def write_chunks(self, addr: int, chunks: Iterable[ByteT]) -> int:
+        pos = addr
+        for c in chunks:
+            self.burst_write(pos, c)
+            pos += len(c)
+        return pos - addr
+
+    def barrier(self) -> None:
+        return None
+
+    def expect(self, addr: int, mask: bytes, value: bytes, timeout: float) -> None:
+        return None
+
 
 @dataclass
 class DummyDevice(Device):
@@ -34,33 +69,155 @@ class DummyDevice(Device):
         return None
 
 
+@dataclass
+class ProxyDevice(Device):
+    name: str = ""
+    device: Device = field(kw_only=True)
+
+    def __post_init__(self) -> None:
+        self.name = self.name or self.device.name
+
+    def read(self, addr: int, size: int) -> bytes:
+        return self.device.read(addr, size)
+
+    def write(self, addr: int, val: ByteT) -> None:
+        return self.device.write(addr, val)
+
+    def burst_read(self, addr: int, size: int) -> bytes:
+        return self.device.burst_read(addr, size)
+
+    def burst_write(self, addr: int, vals: ByteT) -> None:
+        return self.device.burst_write(addr, vals)
+
+    def barrier(self) -> None:
+        return self.device.barrier()
+
+    def expect(self, addr: int, mask: bytes, value: bytes, timeout: float) -> None:
+        return self.device.expect(addr, mask, value, timeout)
+
+
+ipt_bus = buses.register("ipt", lambda: IptDevice.ipt)
+
+
 @dataclass
 class IptDevice(Device):
     class Board(IntEnum):
         GAIA = 0x64
         VENUS = 0x6C
 
+    MAX_BURST: ClassVar[dict[Board, int]] = {Board.GAIA: 32, Board.VENUS: 32}
+    no_burst: ClassVar[set[str]] = set()
+
     device_id: Board = Board.VENUS
+    max_burst: int | None = None
+    bus: Bus = field(default_factory=lambda: ipt_bus, kw_only=True)
     ipt: ClassVar = field(init=False)
 
-    def read(self, addr: int, size: int) -> bytes:
-        # NOTE: dataWidth won't work!!!
-        b = bytearray(size)
-        for i in range(size):
-            b[i], rs = self.ipt.read(
-                i2cid=self.device_id, addr=addr + i, dataWidth=Bits.PER_BYTE
+    @property
+    def handle(self) -> Any:
+        return self.bus.handle
+
+    def lock(self) -> AbstractContextManager[Any]:
+        return self.bus.lock
+
+    @property
+    def burst_size(self) -> int:
+        return self.max_burst or self.MAX_BURST[self.device_id]
+
+    @property
+    def has_burst(self) -> bool:
+        ipt = self.handle
+        if hasattr(ipt, "burstRead") and hasattr(ipt, "burstWrite"):
+            return True
+        if self.bus.name not in self.no_burst:
+            self.no_burst.add(self.bus.name)
+            logger.warning(
+                f"Bus {self.bus.name} has no burstRead/burstWrite, "
+                "falling back to byte-wise transfers"
             )
-            if rs is False:
-                raise RuntimeError
-        return bytes(b)
+        return False
 
+    def chunks(self, addr: int, size: int) -> Iterator[tuple[int, int]]:
+        step = self.burst_size
+        for i in range(0, size, step):
+            yield addr + i, min(step, size - i)
+
+    @probed("read")
+    def read(self, addr: int, size: int) -> bytes:
+        with self.lock():
+            if size > 1 and self.has_burst:
+                return self.burst_read(addr, size)
+            return self.read_bytewise(addr, size)
+
+    @probed("write")
     def write(self, addr: int, val: ByteT) -> None:
-        for i, v in enumerate(val):
-            ret = self.ipt.write(
-                i2cid=self.device_id, addr=addr + i, dat=v, dataWidth=Bits.PER_BYTE
-            )
-            if ret is False:
+        with self.lock():
+            if len(val) > 1 and self.has_burst:
+                return self.burst_write(addr, val)
+            return self.write_bytewise(addr, val)
+
+    @probed("burst_read")
+    def burst_read(self, addr: int, size: int) -> bytes:
+        with self.lock():
+            if not self.has_burst:
+                return self.read_bytewise(addr, size)
+            b = bytearray(size)
+            self.burst_into(addr, memoryview(b))
+            return bytes(b)
+
+    @probed("burst_read")
+    def readinto(self, addr: int, buf: bytearray | memoryview) -> int:
+        with self.lock():
+            if not self.has_burst:
+                buf[:] = self.read_bytewise(addr, len(buf))
+            else:
+                self.burst_into(addr, memoryview(buf))
+            return len(buf)
+
+    def burst_into(self, addr: int, buf: memoryview) -> None:
+        ipt = self.handle
+        for a, n in self.chunks(addr, len(buf)):
+            dat, rs = ipt.burstRead(i2cid=self.device_id, addr=a, length=n)
+            if rs is False:
                 raise RuntimeError
+            buf[a - addr : a - addr + n] = bytes(dat)
+
+    @probed("burst_write")
+    def burst_write(self, addr: int, vals: ByteT) -> None:
+        with self.lock():
+            if not self.has_burst:
+                return self.write_bytewise(addr, vals)
+            ipt = self.handle
+            for a, n in self.chunks(addr, len(vals)):
+                i = a - addr
+                ret = ipt.burstWrite(
+                    i2cid=self.device_id, addr=a, dat=list(vals[i : i + n])
+                )
+                if ret is False:
+                    raise RuntimeError
+
+    def read_bytewise(self, addr: int, size: int) -> bytes:
+        # NOTE: dataWidth won't work!!!
+        with self.lock():
+            ipt = self.handle
+            b = bytearray(size)
+            for i in range(size):
+                b[i], rs = ipt.read(
+                    i2cid=self.device_id, addr=addr + i, dataWidth=Bits.PER_BYTE
+                )
+                if rs is False:
+                    raise RuntimeError
+            return bytes(b)
+
+    def write_bytewise(self, addr: int, val: ByteT) -> None:
+        with self.lock():
+            ipt = self.handle
+            for i, v in enumerate(val):
+                ret = ipt.write(
+                    i2cid=self.device_id, addr=addr + i, dat=v, dataWidth=Bits.PER_BYTE
+                )
+                if ret is False:
+                    raise RuntimeError
 
 
 class DeviceTable(Enum):
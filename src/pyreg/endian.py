@@ -1,7 +1,7 @@
 from enum import StrEnum
 from typing import Literal, Sequence
 
-type ByteT = Sequence[int] | bytes | bytearray
+type ByteT = Sequence[int] | bytes | bytearray | memoryview
 type BitWidthT = Literal[8, 16, 32, 64]
 
 
@@ -26,6 +26,10 @@ class Endian(StrEnum):
     def bytes_to_bytes(self, b: ByteT) -> bytes:
         return bytes(b[::-1])
 
+    def reverse(self, buf: bytearray | memoryview) -> None:
+        view = memoryview(buf)
+        view[:] = view[::-1]
+
     def int_to_int(self, i: int, width: int = 4) -> int:
         return self.bytes_to_int(self.int_to_bytes(i, width)[::-1])
 
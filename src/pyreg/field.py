@@ -1,11 +1,12 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import IntEnum
-from typing import Any, Callable, Self, final, get_args, get_origin
+from typing import Any, Callable, final, get_args
 
 from .endian import Endian
 from .log import logger
 from .mask import BitMask
+from .probe import call
 from .reg import Reg
 
 
@@ -21,14 +22,19 @@ class FieldProperty(BitMask, ABC):
 
     @abstractmethod
     def __get__(self, instance: Reg, owner: type) -> Any:
-        logger.trace(f"Read {self.name}")
-        val = instance.read(self.sl)
-        return val
+        logger.trace("Read {}", self.name)
+        return call("get", instance, self.name, instance.read, self)
 
     @abstractmethod
     def __set__(self, instance: Reg, val: Any) -> None:
-        logger.trace(f"Write {self.name}")
-        instance.modify(val, self.sl)
+        logger.trace("Write {}", self.name)
+        call("set", instance, self.name, instance.modify, val, self)
+
+    def decode(self, val: int) -> Any:
+        return val
+
+    def encode(self, val: Any) -> int:
+        return val
 
     def check_instance(self, instance: Reg) -> Reg:
         if instance is None:  # type: ignore
@@ -52,42 +58,71 @@ class BitField(FieldProperty):
         super().__set__(instance, val)
 
 
-class TrgProperty(FieldProperty, ABC):
+@dataclass(frozen=True)
+class BoundTrigger[P: "TrgProperty"]:
+    prop: P
     instance: Reg
 
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.prop, name)
+
+    def trigger(self, val: Any = None) -> None:
+        call(
+            "trigger", self.instance, self.prop.name, self.prop.fire, self.instance, val
+        )
+
+
+class TrgProperty(FieldProperty, ABC):
     @final
-    def __get__(self, instance: Reg, owner: type) -> Self:
-        self.instance = instance
-        return self
+    def __get__(self, instance: Reg | None, owner: type) -> Any:
+        if instance is None:
+            return self
+        return BoundTrigger(self, instance)
 
     @final
     def __set__(self, instance: Reg, val: int) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def trigger(self, val: Any) -> None: ...
+    def fire(self, instance: Reg, val: Any) -> None: ...
 
 
 @dataclass
 class BitTrigger(TrgProperty):
     val: int = 1
 
-    def trigger(self, val: int | None = None):
+    def fire(self, instance: Reg, val: int | None = None):
         val = val or self.val
-        logger.trace(f"Trigger {self.name}")
-        self.instance.modify(val, self.sl)
-        self.instance.modify(0, self.sl)
+        logger.trace("Trigger {}", self.name)
+        with instance.batch():
+            instance.modify(val, self)
+            instance.flush()
+            instance.device.barrier()
+            instance.modify(0, self)
 
 
 @dataclass
 class BitEnum[T: IntEnum](FieldProperty):
+    enum_type: type[T] = field(init=False, repr=False, compare=False)
+
+    def __set_name__(self, owner: type, name: str):
+        super().__set_name__(owner, name)
+        orig = getattr(self, "__orig_class__", None)
+        if orig is None:
+            raise TypeError(f"{name} requires an IntEnum type argument")
+        self.enum_type = get_args(orig)[0]
+
     def __get__(self, instance: Reg, owner: type) -> T:
-        val = super().__get__(instance, owner)
-        enum_type: type[T] = get_args(get_origin(type(self)))[0]
-        return enum_type(val)
+        return self.decode(super().__get__(instance, owner))
 
     def __set__(self, instance: Reg, val: T):
-        super().__set__(instance, val.value)
+        super().__set__(instance, self.encode(val))
+
+    def decode(self, val: int) -> T:
+        return self.enum_type(val)
+
+    def encode(self, val: T) -> int:
+        return val.value
 
 
 class BitRsvd(FieldProperty):
@@ -103,7 +138,22 @@ class BitBool(FieldProperty):
         super().__init__(b, base=base)
 
     def __get__(self, instance: Reg, owner: type) -> bool:
-        return bool(super().__get__(instance, owner))
+        return self.decode(super().__get__(instance, owner))
 
     def __set__(self, instance: Reg, val: bool):
-        super().__set__(instance, 1 if val else 0)
+        super().__set__(instance, self.encode(val))
+
+    def decode(self, val: int) -> bool:
+        return bool(val)
+
+    def encode(self, val: bool) -> int:
+        return 1 if val else 0
+
+
+def reg_fields(reg: Reg) -> dict[str, FieldProperty]:
+    fields: dict[str, FieldProperty] = {}
+    for cls in reversed(type(reg).__mro__):
+        for name, attr in vars(cls).items():
+            if isinstance(attr, FieldProperty) and not isinstance(attr, BitRsvd):
+                fields[name] = attr
+    return fields
@@ -1,7 +1,12 @@
 import binascii
+from enum import StrEnum
+from pathlib import Path
+from typing import Iterable, Iterator, Self
 
 from .bit import Bits
-from .endian import Endian
+from .endian import ByteT, Endian
+
+type SegmentT = tuple[int, bytes]
 
 
 def is_legal_hex(s: str) -> bool: ...
@@ -21,8 +26,121 @@ def is_legal_bin(s: str):
 
 
 def bin_to_bytes(s: str) -> bytes:
-    if s == "0":
-        return b"\x00"
-    if len(s) <= Bits.PER_BYTE:
-        return Endian.BIG.int_to_bytes(int(s, 2), width=1)
-    return bin_to_bytes(s[:8]) + bin_to_bytes(s[8:])
+    n = Bits.PER_BYTE
+    return bytes(int(s[i : i + n], 2) for i in range(0, len(s), n))
+
+
+class HexFormat(StrEnum):
+    IHEX = "ihex"
+    SREC = "srec"
+
+    @classmethod
+    def of(cls, file: Path) -> Self | None:
+        match file.suffix.lower():
+            case ".hex" | ".ihex" | ".ihx":
+                return cls.IHEX
+            case ".srec" | ".s19" | ".s28" | ".s37" | ".mot":
+                return cls.SREC
+            case _:
+                return None
+
+    def parse(self, lines: Iterable[str]) -> Iterator[SegmentT]:
+        match self:
+            case HexFormat.IHEX:
+                return iter_ihex(lines)
+            case HexFormat.SREC:
+                return iter_srec(lines)
+
+    def dump(self, segments: Iterable[tuple[int, ByteT]]) -> Iterator[str]:
+        match self:
+            case HexFormat.IHEX:
+                return to_ihex(segments)
+            case HexFormat.SREC:
+                return to_srec(segments)
+
+
+def iter_ihex(lines: Iterable[str]) -> Iterator[SegmentT]:
+    base = 0
+    for n, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] != ":":
+            raise ValueError(f"Invalid Intel HEX record at line {n}")
+        rec = hex_to_bytes(line[1:])
+        if len(rec) < 5 or len(rec) != rec[0] + 5 or sum(rec) & 0xFF:
+            raise ValueError(f"Invalid Intel HEX record at line {n}")
+
+        data = rec[4:-1]
+        match rec[3]:
+            case 0x00:
+                yield base + Endian.BIG.bytes_to_int(rec[1:3]), data
+            case 0x01:
+                return
+            case 0x02:
+                base = Endian.BIG.bytes_to_int(data) << 4
+            case 0x04:
+                base = Endian.BIG.bytes_to_int(data) << 16
+            case 0x03 | 0x05:
+                continue
+            case _:
+                raise ValueError(f"Invalid Intel HEX record type at line {n}")
+
+
+def iter_srec(lines: Iterable[str]) -> Iterator[SegmentT]:
+    for n, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] != "S" or len(line) < 4:
+            raise ValueError(f"Invalid S-record at line {n}")
+        rec = hex_to_bytes(line[2:])
+        if len(rec) != rec[0] + 1 or sum(rec) & 0xFF != 0xFF:
+            raise ValueError(f"Invalid S-record at line {n}")
+
+        match line[1]:
+            case "1" | "2" | "3":
+                width = int(line[1]) + 1
+                addr = Endian.BIG.bytes_to_int(rec[1 : 1 + width])
+                yield addr, rec[1 + width : -1]
+            case "7" | "8" | "9":
+                return
+            case "0" | "5" | "6":
+                continue
+            case _:
+                raise ValueError(f"Invalid S-record type at line {n}")
+
+
+def ihex_record(kind: int, addr: int, data: bytes) -> str:
+    rec = bytes([len(data)]) + Endian.BIG.int_to_bytes(addr, 2) + bytes([kind]) + data
+    return ":" + (rec + bytes([-sum(rec) & 0xFF])).hex().upper()
+
+
+def srec_record(kind: int, body: bytes) -> str:
+    rec = bytes([len(body) + 1]) + body
+    return f"S{kind}" + (rec + bytes([~sum(rec) & 0xFF])).hex().upper()
+
+
+def to_ihex(segments: Iterable[tuple[int, ByteT]], width: int = 16) -> Iterator[str]:
+    upper = 0
+    for addr, data in segments:
+        data = bytes(data)
+        pos = 0
+        while pos < len(data):
+            a = addr + pos
+            if a >> 16 != upper:
+                upper = a >> 16
+                yield ihex_record(0x04, 0, Endian.BIG.int_to_bytes(upper, 2))
+            n = min(width, len(data) - pos, 0x10000 - (a & 0xFFFF))
+            yield ihex_record(0x00, a & 0xFFFF, data[pos : pos + n])
+            pos += n
+    yield ihex_record(0x01, 0, b"")
+
+
+def to_srec(segments: Iterable[tuple[int, ByteT]], width: int = 16) -> Iterator[str]:
+    for addr, data in segments:
+        data = bytes(data)
+        for i in range(0, len(data), width):
+            body = Endian.BIG.int_to_bytes(addr + i, 4) + data[i : i + width]
+            yield srec_record(3, body)
+    yield srec_record(7, bytes(4))
@@ -6,22 +6,26 @@ import loguru
 
 @runtime_checkable
 class LoggerProtocol(Protocol):
-    def trace(self, message: str) -> None: ...
-    def debug(self, message: str) -> None: ...
-    def info(self, message: str) -> None: ...
-    def warning(self, message: str) -> None: ...
-    def error(self, message: str) -> None: ...
+    def trace(self, message: str, *args: Any) -> None: ...
+    def debug(self, message: str, *args: Any) -> None: ...
+    def info(self, message: str, *args: Any) -> None: ...
+    def warning(self, message: str, *args: Any) -> None: ...
+    def error(self, message: str, *args: Any) -> None: ...
 
 
 @dataclass
 class Logger:
     _logger: LoggerProtocol
+    level: str
+    is_trace: bool
+    is_debug: bool
 
-    def __init__(self):
+    def __init__(self, level: str = "DEBUG"):
         loguru.logger.remove()
-        loguru.logger.add(lambda msg: print(msg, end=""), level="TRACE")
         assert isinstance(loguru.logger, LoggerProtocol)
         self._logger = loguru.logger
+        self._sink: int | None = None
+        self.set_level(level)
 
     @property
     def logger(self) -> LoggerProtocol:
@@ -31,21 +35,40 @@ class Logger:
     def logger(self, logger: Any):
         assert isinstance(logger, LoggerProtocol)
         self._logger = logger
+        self.is_trace = True
+        self.is_debug = True
 
-    def trace(self, message: str) -> None:
-        return self._logger.trace(message)
+    def set_level(self, level: str, sink: bool = True) -> None:
+        if self._sink is not None:
+            try:
+                loguru.logger.remove(self._sink)
+            except ValueError:
+                pass
+            self._sink = None
+        if sink:
+            self._sink = loguru.logger.add(lambda msg: print(msg, end=""), level=level)
 
-    def debug(self, message: str) -> None:
-        return self._logger.debug(message)
+        no = loguru.logger.level(level).no
+        self.level = level
+        self.is_trace = no <= loguru.logger.level("TRACE").no
+        self.is_debug = no <= loguru.logger.level("DEBUG").no
 
-    def info(self, message: str) -> None:
-        return self._logger.info(message)
+    def trace(self, message: str, *args: Any) -> None:
+        if self.is_trace:
+            self._logger.trace(message, *args)
 
-    def warning(self, message: str) -> None:
-        return self._logger.warning(message)
+    def debug(self, message: str, *args: Any) -> None:
+        if self.is_debug:
+            self._logger.debug(message, *args)
 
-    def error(self, message: str) -> None:
-        return self._logger.error(message)
+    def info(self, message: str, *args: Any) -> None:
+        return self._logger.info(message, *args)
+
+    def warning(self, message: str, *args: Any) -> None:
+        return self._logger.warning(message, *args)
+
+    def error(self, message: str, *args: Any) -> None:
+        return self._logger.error(message, *args)
 
 
 logger = Logger()
@@ -1,4 +1,5 @@
 from dataclasses import InitVar, dataclass, field
+from functools import cache
 from typing import Self
 
 
@@ -43,6 +44,7 @@ class BitMask(Mask):
     mask: int = field(init=False)
     s: int = field(init=False)
     l: int = field(init=False)
+    field_mask: int = field(init=False, repr=False, compare=False)
 
     bit: InitVar[BitT]
     base: InitVar[int] = 0
@@ -68,13 +70,30 @@ class BitMask(Mask):
         super().__init__(mask)
         self.s = s
         self.l = l
+        self.field_mask = (1 << l) - 1
+
+    @classmethod
+    def of(cls, bit: "BitT | BitMask") -> "BitMask":
+        match bit:
+            case BitMask():
+                return bit
+            case list():
+                assert len(bit) == 2
+                return _intern((bit[0], bit[1] - bit[0] + 1))
+            case _:
+                return _intern(bit)
 
     @property
     def sl(self) -> tuple[int, int]:
         return self.s, self.l
 
     def get_field(self, val: int) -> int:
-        return (val >> self.s) & ((1 << self.l) - 1)
+        return (val >> self.s) & self.field_mask
 
     def set_field(self, val: int, v: int) -> int:
-        return (val & ~self.mask) | ((v & ((1 << self.l) - 1)) << self.s)
+        return (val & ~self.mask) | ((v & self.field_mask) << self.s)
+
+
+@cache
+def _intern(bit: int | tuple[int, int]) -> BitMask:
+    return BitMask(bit)
@@ -0,0 +1,241 @@
+import bisect
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, ClassVar, Self
+
+from .device import ProxyDevice
+from .endian import ByteT
+from .probe import Probe, Span, current, install, uninstall
+from .reg import Reg
+
+
+@dataclass
+class Histogram:
+    BOUNDS: ClassVar[tuple[int, ...]] = tuple(
+        m * 10**e for e in range(3, 10) for m in (1, 2, 5)
+    )
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(Histogram.BOUNDS) + 1))
+    count: int = 0
+    total: int = 0
+    min: int = 0
+    max: int = 0
+
+    def add(self, ns: int) -> None:
+        self.counts[bisect.bisect_left(self.BOUNDS, ns)] += 1
+        if self.count == 0 or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.count += 1
+        self.total += ns
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> int:
+        if self.count == 0:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.BOUNDS[i] if i < len(self.BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ns": self.total,
+            "mean_ns": round(self.mean),
+            "min_ns": self.min,
+            "max_ns": self.max,
+            "p50_ns": self.quantile(0.5),
+            "p99_ns": self.quantile(0.99),
+            "buckets": {f"le_{b}": n for b, n in zip(self.BOUNDS, self.counts) if n}
+            | ({"inf": self.counts[-1]} if self.counts[-1] else {}),
+        }
+
+
+@dataclass
+class Stat:
+    count: int = 0
+    reads: int = 0
+    writes: int = 0
+    bytes: int = 0
+    latency: Histogram = field(default_factory=Histogram)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "reads": self.reads,
+            "writes": self.writes,
+            "bytes": self.bytes,
+            "latency": self.latency.to_dict(),
+        }
+
+
+type Key = tuple[str, str | None, str]
+
+
+@dataclass
+class MetricsDevice(ProxyDevice, Probe):
+    names: dict[int, str] = field(default_factory=dict[int, str], kw_only=True)
+
+    transactions: dict[str, Stat] = field(default_factory=dict[str, Stat], init=False)
+    ops: dict[Key, Stat] = field(default_factory=dict[Key, Stat], init=False)
+    started: float = field(default_factory=time.time, init=False)
+
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def add_names(self, regmap: type[Enum]) -> Self:
+        for m in regmap:
+            if isinstance(m.value, Reg):
+                self.names.setdefault(m.value.addr, m.name)
+        return self
+
+    def label(self, addr: int) -> str:
+        return self.names.get(addr) or f"{addr:#06x}"
+
+    def owner(self, span: Span | None) -> Span | None:
+        if span is None:
+            return None
+        reg = next((s.target for s in span.chain() if isinstance(s.target, Reg)), None)
+        if reg is None:
+            return None
+        found: Span | None = None
+        for s in span.chain():
+            if s.target is reg:
+                found = s
+            elif found is not None:
+                break
+        return found
+
+    def key(self, span: Span) -> Key:
+        reg: Reg = span.target
+        return self.label(reg.addr), span.field, span.op
+
+    def record(self, kind: str, addr: int, size: int, ns: int, write: bool) -> None:
+        owner = self.owner(current())
+        key = self.key(owner) if owner is not None else (self.label(addr), None, "raw")
+        with self._lock:
+            stat = self.transactions.setdefault(kind, Stat())
+            stat.count += 1
+            stat.bytes += size
+            stat.latency.add(ns)
+            op = self.ops.setdefault(key, Stat())
+            op.bytes += size
+            if write:
+                op.writes += 1
+            else:
+                op.reads += 1
+
+    def exit(self, span: Span) -> None:
+        if not isinstance(span.target, Reg) or span.target.device is not self:
+            return
+        parent = span.parent
+        if parent is not None and parent.target is span.target:
+            return
+        key = self.key(span)
+        with self._lock:
+            stat = self.ops.setdefault(key, Stat())
+            stat.count += 1
+            stat.latency.add(span.elapsed)
+
+    def read(self, addr: int, size: int) -> bytes:
+        start = time.perf_counter_ns()
+        b = self.device.read(addr, size)
+        self.record("read", addr, size, time.perf_counter_ns() - start, False)
+        return b
+
+    def write(self, addr: int, val: ByteT) -> None:
+        start = time.perf_counter_ns()
+        self.device.write(addr, val)
+        self.record("write", addr, len(val), time.perf_counter_ns() - start, True)
+
+    def burst_read(self, addr: int, size: int) -> bytes:
+        start = time.perf_counter_ns()
+        b = self.device.burst_read(addr, size)
+        self.record("burst_read", addr, size, time.perf_counter_ns() - start, False)
+        return b
+
+    def burst_write(self, addr: int, vals: ByteT) -> None:
+        start = time.perf_counter_ns()
+        self.device.burst_write(addr, vals)
+        ns = time.perf_counter_ns() - start
+        self.record("burst_write", addr, len(vals), ns, True)
+
+    def start(self) -> Self:
+        install(self)
+        return self
+
+    def stop(self) -> None:
+        uninstall(self)
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.transactions.clear()
+            self.ops.clear()
+            self.started = time.time()
+
+    def hot(self, n: int = 10) -> list[tuple[Key, Stat]]:
+        with self._lock:
+            items = list(self.ops.items())
+        items.sort(
+            key=lambda kv: (kv[1].reads + kv[1].writes, kv[1].count), reverse=True
+        )
+        return items[:n]
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "device": self.name,
+                "started": self.started,
+                "elapsed": time.time() - self.started,
+                "transactions": {k: s.to_dict() for k, s in self.transactions.items()},
+                "ops": [
+                    {"reg": reg, "field": fld, "op": op} | s.to_dict()
+                    for (reg, fld, op), s in self.ops.items()
+                ],
+            }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def report(self, n: int = 20) -> str:
+        lines = [f"{self.name}: {time.time() - self.started:.3f}s"]
+        lines.append(
+            f"{'kind':<12} {'count':>8} {'bytes':>10} {'mean':>10} {'p99':>10}"
+        )
+        with self._lock:
+            transactions = list(self.transactions.items())
+        for kind, s in transactions:
+            h = s.latency
+            lines.append(
+                f"{kind:<12} {s.count:>8} {s.bytes:>10} "
+                f"{h.mean / 1e3:>8.1f}us {h.quantile(0.99) / 1e3:>8.1f}us"
+            )
+        lines.append("")
+        lines.append(
+            f"{'reg':<24} {'field':<20} {'op':<8} {'calls':>7} {'reads':>7} "
+            f"{'writes':>7} {'bytes':>8} {'mean':>10}"
+        )
+        for (reg, fld, op), s in self.hot(n):
+            lines.append(
+                f"{reg:<24} {fld or '-':<20} {op:<8} {s.count:>7} {s.reads:>7} "
+                f"{s.writes:>7} {s.bytes:>8} {s.latency.mean / 1e3:>8.1f}us"
+            )
+        return "\n".join(lines)
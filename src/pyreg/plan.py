@@ -0,0 +1,72 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Iterable
+
+from .device import Device
+from .log import logger
+from .reg import Reg
+from .regmap import RegMap
+
+
+@dataclass
+class Span:
+    device: Device
+    addr: int
+    size: int
+    regs: list[Reg] = field(default_factory=list[Reg])
+
+    @property
+    def end(self) -> int:
+        return self.addr + self.size
+
+    def read(self) -> list[tuple[Reg, int]]:
+        buf = self.device.read(self.addr, self.size)
+        logger.trace("Read Span: {:#10x} {} bytes", self.addr, self.size)
+        vals: list[tuple[Reg, int]] = []
+        for reg in self.regs:
+            i = reg.addr - self.addr
+            b = buf[i : i + reg.size]
+            if (shadow := reg.shadow) is not None:
+                shadow.put(reg.addr, b)
+            vals.append((reg, reg.endian.bytes_to_int(b)))
+        return vals
+
+
+def plan_reads(regs: Iterable[Reg], gap: int = 4) -> list[Span]:
+    devices: dict[int, tuple[list[Reg], list[Reg]]] = {}
+    for reg in regs:
+        readable, holes = devices.setdefault(id(reg.device), ([], []))
+        if reg.mode.is_readable and reg.size > 0:
+            readable.append(reg)
+        else:
+            holes.append(reg)
+
+    spans: list[Span] = []
+    for readable, holes in devices.values():
+        index = RegMap.of(holes)
+        span: Span | None = None
+        for reg in sorted(readable, key=lambda r: r.addr):
+            if (
+                span is not None
+                and reg.addr <= span.end + gap
+                and next(index.range(span.end, reg.addr), None) is None
+            ):
+                span.size = max(span.end, reg.addr + reg.size) - span.addr
+                span.regs.append(reg)
+                continue
+            span = Span(reg.device, reg.addr, reg.size, [reg])
+            spans.append(span)
+    return spans
+
+
+def read_regs(regs: Iterable[Reg], gap: int = 4) -> list[tuple[Reg, int]]:
+    vals: list[tuple[Reg, int]] = []
+    for span in plan_reads(regs, gap):
+        vals.extend(span.read())
+    return vals
+
+
+def snapshot(regmap: type[Enum], gap: int = 4) -> dict[str, int]:
+    names = {id(m.value): m.name for m in regmap}
+    vals = read_regs((m.value for m in regmap), gap)
+    return {names[id(reg)]: val for reg, val in vals}
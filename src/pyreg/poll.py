@@ -0,0 +1,41 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+
+@dataclass(frozen=True)
+class Backoff:
+    spin: int = 2
+    delay: float = 0.0005
+    factor: float = 2.0
+    max_delay: float = 0.05
+
+    @classmethod
+    def fixed(cls, delay: float) -> "Backoff":
+        return cls(spin=0, delay=delay, factor=1.0, max_delay=delay)
+
+    def delays(self) -> Iterator[float]:
+        for _ in range(self.spin):
+            yield 0.0
+        delay = self.delay
+        while True:
+            yield delay
+            delay = min(delay * self.factor, self.max_delay)
+
+
+def poll(
+    check: Callable[[], bool],
+    timeout: float = 5.0,
+    backoff: Backoff = Backoff(),
+) -> float:
+    start = time.monotonic()
+    deadline = start + timeout
+    for delay in backoff.delays():
+        if check():
+            return time.monotonic() - start
+        now = time.monotonic()
+        if now >= deadline:
+            break
+        if delay:
+            time.sleep(min(delay, deadline - now))
+    raise TimeoutError(f"Condition not met within {timeout}s")
@@ -0,0 +1,115 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Concatenate, Iterator
+
+
+@dataclass(slots=True, eq=False)
+class Span:
+    op: str
+    target: Any
+    field: str | None = None
+    parent: "Span | None" = None
+    start: int = 0
+    end: int = 0
+    error: BaseException | None = None
+    args: tuple[Any, ...] = ()
+
+    @property
+    def elapsed(self) -> int:
+        return self.end - self.start
+
+    def chain(self) -> Iterator["Span"]:
+        span: Span | None = self
+        while span is not None:
+            yield span
+            span = span.parent
+
+
+class Probe:
+    def enter(self, span: Span) -> None:
+        return None
+
+    def exit(self, span: Span) -> None:
+        return None
+
+
+probes: list[Probe] = []
+_lock = threading.Lock()
+_current: ContextVar[Span | None] = ContextVar("pyreg_span", default=None)
+
+
+def install(probe: Probe) -> None:
+    with _lock:
+        if probe not in probes:
+            probes.append(probe)
+
+
+def uninstall(probe: Probe) -> None:
+    with _lock:
+        if probe in probes:
+            probes.remove(probe)
+
+
+@contextmanager
+def probing(probe: Probe) -> Iterator[Probe]:
+    install(probe)
+    try:
+        yield probe
+    finally:
+        uninstall(probe)
+
+
+def current() -> Span | None:
+    return _current.get()
+
+
+@contextmanager
+def span(
+    op: str, target: Any, name: str | None = None, args: tuple[Any, ...] = ()
+) -> Iterator[Span]:
+    s = Span(op, target, name, _current.get(), time.perf_counter_ns(), args=args)
+    token = _current.set(s)
+    active = tuple(probes)
+    for p in active:
+        p.enter(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error = e
+        raise
+    finally:
+        s.end = time.perf_counter_ns()
+        _current.reset(token)
+        for p in reversed(active):
+            p.exit(s)
+
+
+def call[R](
+    op: str, target: Any, name: str | None, func: Callable[..., R], *args: Any
+) -> R:
+    if not probes:
+        return func(*args)
+    with span(op, target, name, args):
+        return func(*args)
+
+
+def probed[S, **P, R](
+    op: str,
+) -> Callable[[Callable[Concatenate[S, P], R]], Callable[Concatenate[S, P], R]]:
+    def decorator(
+        func: Callable[Concatenate[S, P], R],
+    ) -> Callable[Concatenate[S, P], R]:
+        @wraps(func)
+        def wrapper(self: S, *args: P.args, **kwargs: P.kwargs) -> R:
+            if not probes:
+                return func(self, *args, **kwargs)
+            with span(op, self, args=args):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,158 @@
+import struct
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Iterator, Self
+
+from .device import Device, ProxyDevice
+from .endian import ByteT
+
+
+class TraceOp(IntEnum):
+    READ = 0
+    WRITE = 1
+    BURST_READ = 2
+    BURST_WRITE = 3
+
+
+@dataclass(frozen=True)
+class TraceRecord:
+    HEADER = struct.Struct("<BdQI")
+
+    op: TraceOp
+    time: float
+    addr: int
+    data: bytes
+
+    def pack(self) -> bytes:
+        return (
+            self.HEADER.pack(self.op, self.time, self.addr, len(self.data)) + self.data
+        )
+
+    @classmethod
+    def unpack(cls, fp: BinaryIO) -> Self | None:
+        head = fp.read(cls.HEADER.size)
+        if not head:
+            return None
+        if len(head) != cls.HEADER.size:
+            raise EOFError("Truncated trace record")
+        op, t, addr, size = cls.HEADER.unpack(head)
+        data = fp.read(size)
+        if len(data) != size:
+            raise EOFError("Truncated trace record")
+        return cls(TraceOp(op), t, addr, data)
+
+
+MAGIC = b"PYRGTRC1"
+
+
+def iter_trace(file: Path) -> Iterator[TraceRecord]:
+    with file.open(mode="rb") as fp:
+        if fp.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a pyreg trace: {file}")
+        while (rec := TraceRecord.unpack(fp)) is not None:
+            yield rec
+
+
+@dataclass
+class RecordingDevice(ProxyDevice):
+    file: Path = field(kw_only=True)
+    fp: BinaryIO = field(init=False, repr=False)
+    start: float = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.fp = self.file.open(mode="wb")
+        self.fp.write(MAGIC)
+        self.start = time.perf_counter()
+
+    def log(self, op: TraceOp, addr: int, data: ByteT) -> None:
+        t = time.perf_counter() - self.start
+        self.fp.write(TraceRecord(op, t, addr, bytes(data)).pack())
+
+    def close(self) -> None:
+        self.fp.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def read(self, addr: int, size: int) -> bytes:
+        b = self.device.read(addr, size)
+        self.log(TraceOp.READ, addr, b)
+        return b
+
+    def write(self, addr: int, val: ByteT) -> None:
+        self.device.write(addr, val)
+        self.log(TraceOp.WRITE, addr, val)
+
+    def burst_read(self, addr: int, size: int) -> bytes:
+        b = self.device.burst_read(addr, size)
+        self.log(TraceOp.BURST_READ, addr, b)
+        return b
+
+    def burst_write(self, addr: int, vals: ByteT) -> None:
+        self.device.burst_write(addr, vals)
+        self.log(TraceOp.BURST_WRITE, addr, vals)
+
+
+class ReplayError(Exception): ...
+
+
+@dataclass
+class ReplayDevice(Device):
+    name: str = "REPLAY"
+    file: Path = field(kw_only=True)
+    index: int = field(default=0, init=False)
+    records: Iterator[TraceRecord] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.records = iter_trace(self.file)
+
+    def next(self, op: TraceOp, addr: int, size: int) -> TraceRecord:
+        rec = next(self.records, None)
+        self.index += 1
+        if rec is None:
+            raise ReplayError(f"#{self.index}: trace ended, got {op.name} {addr:#x}")
+        if rec.op is not op or rec.addr != addr or len(rec.data) != size:
+            raise ReplayError(
+                f"#{self.index}: expected {rec.op.name} {rec.addr:#x}+{len(rec.data)},"
+                f" got {op.name} {addr:#x}+{size}"
+            )
+        return rec
+
+    def check(self, op: TraceOp, addr: int, val: ByteT) -> None:
+        rec = self.next(op, addr, len(val))
+        if rec.data != bytes(val):
+            raise ReplayError(
+                f"#{self.index}: {op.name} {addr:#x} expected {rec.data.hex()},"
+                f" got {bytes(val).hex()}"
+            )
+
+    def finish(self) -> None:
+        rec = next(self.records, None)
+        if rec is not None:
+            raise ReplayError(
+                f"#{self.index + 1}: {rec.op.name} {rec.addr:#x} was not replayed"
+            )
+
+    def read(self, addr: int, size: int) -> bytes:
+        return self.next(TraceOp.READ, addr, size).data
+
+    def write(self, addr: int, val: ByteT) -> None:
+        self.check(TraceOp.WRITE, addr, val)
+
+    def burst_read(self, addr: int, size: int) -> bytes:
+        return self.next(TraceOp.BURST_READ, addr, size).data
+
+    def burst_write(self, addr: int, vals: ByteT) -> None:
+        self.check(TraceOp.BURST_WRITE, addr, vals)
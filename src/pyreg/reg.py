@@ -1,12 +1,19 @@
+import copy
+import threading
+from contextlib import contextmanager
 from dataclasses import KW_ONLY, dataclass, field
 from enum import IntFlag
-from typing import get_args, get_origin
+from functools import cached_property
+from typing import Callable, Iterable, Iterator, Self, get_args
 
 from .access import Access
+from .cache import Shadow
 from .device import Device, current_device
-from .endian import Endian
+from .endian import ByteT, Endian
 from .log import logger
 from .mask import BitMask, BitT, Mask
+from .poll import Backoff, poll
+from .probe import probed
 
 
 class RegError(Exception): ...
@@ -18,6 +25,9 @@ class RegSetError(RegError): ...
 class RegClearError(RegError): ...
 
 
+class RegFlagError(RegError): ...
+
+
 @dataclass
 class Reg:
     addr: int
@@ -27,8 +37,32 @@ class Reg:
     default: bytes = b"\x00\x00\x00\x00"
     endian: Endian = Endian.LITTLE
     width: int = 4
+    volatile: bool = False
     device: Device = field(default_factory=lambda: current_device.value)
 
+    _pending: tuple[int, int] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _base: int | None = field(default=None, init=False, repr=False, compare=False)
+    _read: bool = field(default=True, init=False, repr=False, compare=False)
+    _lock: threading.RLock = field(
+        default_factory=threading.RLock, init=False, repr=False, compare=False
+    )
+
+    @property
+    def shadow(self) -> Shadow | None:
+        if self.volatile:
+            return None
+        return self.device.shadow
+
+    def on(self, device: Device) -> Self:
+        reg = copy.copy(self)
+        reg.device = device
+        reg._pending = None
+        reg._base = None
+        reg._lock = threading.RLock()
+        return reg
+
     def check_read(self) -> None:
         if not self.mode.is_readable:
             raise ValueError
@@ -37,22 +71,49 @@ class Reg:
         if not self.mode.is_writable:
             raise ValueError
 
-    def read(self, bit: BitT | None = None) -> int:
+    @probed("read")
+    def read(self, bit: BitT | BitMask | None = None) -> int:
         self.check_read()
 
-        val = self.device.read(self.addr, self.size)
-        val = self.endian.bytes_to_int(val)
+        with self._lock:
+            val = self.device.read(self.addr, self.size)
+            if (shadow := self.shadow) is not None:
+                shadow.put(self.addr, val)
+            val = self.endian.bytes_to_int(val)
+
+            if self._pending is not None:
+                mask, bits = self._pending
+                val = (val & ~mask) | bits
 
         if bit is not None:
-            val = BitMask(bit).get_field(val)
+            val = BitMask.of(bit).get_field(val)
+
+        logger.trace("Read Reg: {:#10x} {:#04x}", self.addr, val)
 
-        logger.trace(f"Read Reg: {self.addr:#10x} {val:#04x}")
+        return val
 
+    def read_cached(self) -> int:
+        shadow = self.shadow
+        if shadow is None:
+            return self.read()
+        b = shadow.get(self.addr, self.size)
+        if b is None:
+            return self.read()
+        val = self.endian.bytes_to_int(b)
+        logger.trace("Read Shadow: {:#10x} {:#04x}", self.addr, val)
         return val
 
+    def refresh(self) -> int:
+        return self.read()
+
+    def invalidate(self) -> None:
+        if (shadow := self.device.shadow) is not None:
+            shadow.invalidate(self.addr, self.size)
+
+    @probed("check")
     def check(
         self,
-        bit: BitT | None = None,
+        bit: BitT | BitMask | None = None,
         set_mask: int | None = None,
         clear_mask: int | None = None,
     ) -> tuple[int, bool, bool]:
@@ -61,7 +122,7 @@ class Reg:
         val = self.device.read(self.addr, self.size)
         val = self.endian.bytes_to_int(val)
 
-        logger.trace(f"Read Reg: {self.addr:#10x} {val:#04x}")
+        logger.trace("Read Reg: {:#10x} {:#04x}", self.addr, val)
 
         is_set = True
         is_clear = True
@@ -72,12 +133,31 @@ class Reg:
             logger.warning(f"Reg {self.addr:#4x} not clear")
             is_clear = False
         if bit is not None:
-            val = BitMask(bit).get_field(val)
+            val = BitMask.of(bit).get_field(val)
 
-        logger.trace(f"Check Reg: {self.addr:#10x}={val:#04x}, {is_set=}, {is_clear=}")
+        logger.trace(
+            "Check Reg: {:#10x}={:#04x}, is_set={}, is_clear={}",
+            self.addr,
+            val,
+            is_set,
+            is_clear,
+        )
 
         return val, is_set, is_clear
 
+    @probed("wait")
+    def wait_until(
+        self,
+        condition: Callable[[int], bool],
+        timeout: float = 5.0,
+        bit: BitT | BitMask | None = None,
+        backoff: Backoff = Backoff(),
+    ) -> float:
+        elapsed = poll(lambda: condition(self.read(bit)), timeout, backoff)
+        logger.trace("Wait Reg: {:#10x} {:.6f}s", self.addr, elapsed)
+        return elapsed
+
+    @probed("read")
     def read_bytes(self, size: int | None = None) -> bytes:
         self.check_read()
         size = size or self.size
@@ -86,73 +166,231 @@ class Reg:
             return self.endian.bytes_to_bytes(b)
         return b
 
+    @probed("read")
+    def readinto(self, buf: bytearray | memoryview) -> int:
+        self.check_read()
+        n = self.device.readinto(self.addr, buf)
+        if self.endian.is_big:
+            self.endian.reverse(buf)
+        return n
+
+    def stream(self, chunk: int = 256, size: int | None = None) -> Iterator[memoryview]:
+        self.check_read()
+        size = size or self.size
+        if not self.endian.is_big:
+            yield from self.device.stream(self.addr, size, chunk)
+            return
+        buf = memoryview(bytearray(min(chunk, size)))
+        for end in range(size, 0, -chunk):
+            n = min(chunk, end)
+            view = buf[:n]
+            self.device.readinto(self.addr + end - n, view)
+            self.endian.reverse(view)
+            yield view
+
+    @probed("write")
+    def write_chunks(self, chunks: Iterable[ByteT]) -> int:
+        self.check_write()
+
+        def bounded() -> Iterator[ByteT]:
+            pos = 0
+            for c in chunks:
+                pos += len(c)
+                if pos > self.size:
+                    raise ValueError(f"Write past Reg {self.addr:#x} ({self.size})")
+                yield c
+
+        with self._lock:
+            try:
+                return self.device.write_chunks(self.addr, bounded())
+            finally:
+                self.invalidate()
+
+    @probed("write")
     def write(self, val: int = 0) -> None:
         self.check_write()
 
-        logger.trace(f"Write Reg {self.addr:#010x}: {val:#04x}")
-        b = self.endian.int_to_bytes(val, self.size)
-        return self.device.write(self.addr, b)
+        with self._lock:
+            if self._pending is not None:
+                self._pending = self.full_mask, val & self.full_mask
+                return
 
+            logger.trace("Write Reg {:#010x}: {:#04x}", self.addr, val)
+            self._commit(val)
+
+    @probed("modify")
     def modify(
         self,
         val: int = 0,
-        bit: BitT | None = None,
+        bit: BitT | BitMask | None = None,
         set_mask: int | None = None,
         clear_mask: int | None = None,
     ):
         self.check_read()
         self.check_write()
 
-        rv = self.read()
-        logger.trace(f"Read Reg: {self.addr:#10x} {rv:#04x}")
+        with self._lock:
+            if self._pending is not None:
+                self._stage(val, bit, set_mask, clear_mask)
+                return
 
-        if bit is not None:
-            rv = BitMask(bit).set_field(rv, val)
-        if set_mask is not None:
-            rv = Mask(set_mask).set(rv)
-        if clear_mask is not None:
-            rv = Mask(clear_mask).clear(rv)
-        val = rv
+            rv = self.read_cached()
+            logger.trace("Read Reg: {:#10x} {:#04x}", self.addr, rv)
+
+            if bit is not None:
+                rv = BitMask.of(bit).set_field(rv, val)
+            if set_mask is not None:
+                rv = Mask(set_mask).set(rv)
+            if clear_mask is not None:
+                rv = Mask(clear_mask).clear(rv)
+            val = rv
 
-        logger.trace(f"Modify Reg {self.addr:#010x}: {val:#04x}")
+            logger.trace("Modify Reg {:#010x}: {:#04x}", self.addr, val)
+            self._commit(val)
+
+    def _commit(self, val: int) -> None:
         b = self.endian.int_to_bytes(val, self.size)
-        return self.device.write(self.addr, b)
+        self.device.write(self.addr, b)
+        if (shadow := self.shadow) is not None:
+            shadow.put(self.addr, b)
+
+    @property
+    def full_mask(self) -> int:
+        return (1 << (self.size * 8)) - 1
 
+    def _stage(
+        self,
+        val: int,
+        bit: BitT | BitMask | None,
+        set_mask: int | None,
+        clear_mask: int | None,
+    ) -> None:
+        assert self._pending is not None
+        mask, bits = self._pending
+        if bit is not None:
+            bm = BitMask.of(bit)
+            mask |= bm.mask
+            bits = bm.set_field(bits, val)
+        if set_mask is not None:
+            mask |= set_mask
+            bits |= set_mask
+        if clear_mask is not None:
+            mask |= clear_mask
+            bits &= ~clear_mask
+        self._pending = mask, bits
+
+    @contextmanager
+    def batch(self, read: bool = True) -> Iterator[Self]:
+        with self._lock:
+            if self._pending is not None:
+                yield self
+                return
+
+            self._pending = (0, 0)
+            self._read = read
+            try:
+                yield self
+                self.flush()
+            finally:
+                self._pending = None
+                self._base = None
+
+    @probed("flush")
+    def flush(self, read: bool | None = None) -> None:
+        with self._lock:
+            if self._pending is None:
+                return
+            mask, bits = self._pending
+            if mask == 0:
+                return
+            self._pending = (0, 0)
+
+            if read is None:
+                read = self._read
+            if mask == self.full_mask:
+                rv = 0
+            elif self._base is not None:
+                rv = self._base
+            elif read:
+                rv = self.read_cached()
+            else:
+                rv = self.endian.bytes_to_int(self.default) & self.full_mask
+            val = (rv & ~mask) | bits
+
+            logger.trace("Flush Reg {:#010x}: {:#04x}", self.addr, val)
+            self._commit(val)
+            self._base = val
+
+    @probed("write")
     def write_bytes(self, vals: bytes | bytearray) -> None:
         assert len(vals) <= self.size
         if len(vals) != self.size:
             logger.warning(f"Write only {len(vals)} bytes for Reg {self.addr} ")
-        self.device.burst_write(self.addr, vals)
+        with self._lock:
+            self.device.burst_write(self.addr, vals)
+            self.invalidate()
 
 
 @dataclass
 class RegRo(Reg):
-    mode = Access.R
+    mode: Access = field(default=Access.R, kw_only=True)
 
 
 @dataclass
 class RegWo(Reg):
-    mode = Access.W
+    mode: Access = field(default=Access.W, kw_only=True)
 
 
 @dataclass
 class RegRw(Reg):
-    mode = Access.R | Access.W
+    mode: Access = field(default=Access.R | Access.W, kw_only=True)
 
 
 @dataclass
 class RegRsvd(Reg):
-    mode = Access(0)
+    mode: Access = field(default=Access(0), kw_only=True)
 
 
 @dataclass
 class RegFlags[T: IntFlag](RegRo):
+    volatile: bool = field(default=True, kw_only=True)
+
+    @cached_property
+    def flag_type(self) -> type[T]:
+        orig = getattr(self, "__orig_class__", None)
+        if orig is None:
+            raise TypeError(f"{type(self).__name__} requires an IntFlag type argument")
+        return get_args(orig)[0]
+
     def flags(self) -> T:
-        val = self.read()
-        # enum_type: type[T] = self.__orig_class__.__args__[0]  # type: ignore
-        origin = get_origin(type(self))
-        enum_type = get_args(origin)[0]
-        return enum_type(val)
+        return self.flag_type(self.read())
+
+    @probed("wait")
+    def wait_for(
+        self,
+        set: T | None = None,
+        clear: T | None = None,
+        error: T | None = None,
+        timeout: float = 5.0,
+        backoff: Backoff = Backoff(),
+        error_when_done: bool = False,
+    ) -> float:
+        def condition(val: int) -> bool:
+            done = (set is None or val & set == set) and (
+                clear is None or val & clear == 0
+            )
+            if error is not None and val & error and (done or not error_when_done):
+                raise RegFlagError(f"Reg {self.addr:#x} error {self.flag_type(val)!r}")
+            return done
+
+        mask = (set or 0) | (clear or 0)
+        self.device.expect(
+            self.addr,
+            self.endian.int_to_bytes(mask, self.size),
+            self.endian.int_to_bytes(set or 0, self.size),
+            timeout,
+        )
+        return self.wait_until(condition, timeout, backoff=backoff)
 
     def is_set(self, flag: T) -> bool:
         val = self.read()
@@ -161,3 +399,16 @@ class RegFlags[T: IntFlag](RegRo):
     def is_clear(self, flag: T) -> bool:
         val = self.read()
         return flag.value & val == 0
+
+
+@contextmanager
+def bind(regs: Iterable[Reg], device: Device) -> Iterator[Device]:
+    regs = list(regs)
+    saved = [reg.device for reg in regs]
+    for reg in regs:
+        reg.device = device
+    try:
+        yield device
+    finally:
+        for reg, dev in zip(regs, saved):
+            reg.device = dev
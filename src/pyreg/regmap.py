@@ -0,0 +1,189 @@
+import bisect
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Iterable, Iterator, Self
+
+from .field import reg_fields
+from .log import logger
+from .reg import Reg
+
+
+@dataclass(frozen=True)
+class RegEntry:
+    name: str
+    reg: Reg
+
+    @property
+    def start(self) -> int:
+        return self.reg.addr
+
+    @property
+    def end(self) -> int:
+        return self.reg.addr + self.reg.size
+
+    @property
+    def alignment(self) -> int:
+        if self.reg.size <= 0:
+            return 1
+        return min(self.reg.width, 1 << (self.reg.size.bit_length() - 1))
+
+
+@dataclass(frozen=True)
+class Issue:
+    kind: str
+    message: str
+    entries: tuple[RegEntry, ...]
+
+
+type RegSource = type[Enum] | Iterable[Reg] | Iterable[tuple[str, Reg]]
+
+
+@dataclass
+class Nest:
+    entries: list[RegEntry] = field(default_factory=list[RegEntry])
+    starts: list[int] = field(default_factory=list[int])
+    ends: list[int] = field(default_factory=list[int])
+    children: list["Nest"] = field(default_factory=list["Nest"])
+
+    def add(self, entry: RegEntry) -> "Nest":
+        child = Nest()
+        self.entries.append(entry)
+        self.starts.append(entry.start)
+        self.ends.append(entry.end)
+        self.children.append(child)
+        return child
+
+    def find(self, addr: int, found: list[RegEntry]) -> None:
+        i = bisect.bisect_right(self.starts, addr) - 1
+        while i >= 0 and self.ends[i] > addr:
+            found.append(self.entries[i])
+            if self.children[i].entries:
+                self.children[i].find(addr, found)
+            i -= 1
+
+    def overlap(self, lo: int, hi: int) -> Iterator[RegEntry]:
+        i = bisect.bisect_right(self.ends, lo)
+        while i < len(self.entries) and self.starts[i] < hi:
+            yield self.entries[i]
+            if self.children[i].entries:
+                yield from self.children[i].overlap(lo, hi)
+            i += 1
+
+
+@dataclass
+class RegMap:
+    entries: list[RegEntry]
+    nest: Nest = field(init=False, repr=False)
+    names: dict[str, RegEntry] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.entries.sort(key=lambda e: (e.start, -e.end))
+        self.nest = Nest()
+        stack: list[tuple[RegEntry, Nest]] = []
+        for e in self.entries:
+            while stack and stack[-1][0].end < e.end:
+                stack.pop()
+            parent = stack[-1][1] if stack else self.nest
+            stack.append((e, parent.add(e)))
+        self.names = {e.name: e for e in self.entries}
+
+    @classmethod
+    def of(cls, *sources: RegSource) -> Self:
+        entries: list[RegEntry] = []
+        for source in sources:
+            for item in source:
+                match item:
+                    case Enum() if isinstance(item.value, Reg):
+                        entries.append(RegEntry(item.name, item.value))
+                    case (str() as name, Reg() as reg):
+                        entries.append(RegEntry(name, reg))
+                    case Reg():
+                        entries.append(RegEntry(f"{item.addr:#06x}", item))
+                    case _:
+                        pass
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[RegEntry]:
+        return iter(self.entries)
+
+    def __getitem__(self, name: str) -> Reg:
+        return self.names[name].reg
+
+    def __contains__(self, addr: int) -> bool:
+        return self.lookup(addr) is not None
+
+    def find(self, addr: int) -> list[RegEntry]:
+        found: list[RegEntry] = []
+        self.nest.find(addr, found)
+        return found
+
+    def lookup(self, addr: int) -> RegEntry | None:
+        return min(self.find(addr), key=lambda e: e.reg.size, default=None)
+
+    def name(self, addr: int) -> str:
+        entry = self.lookup(addr)
+        if entry is None:
+            return f"{addr:#06x}"
+        if addr == entry.start:
+            return entry.name
+        return f"{entry.name}+{addr - entry.start}"
+
+    def fields(self, addr: int, bit: int | None = None) -> list[str]:
+        entry = self.lookup(addr)
+        if entry is None:
+            return []
+        reg = entry.reg
+        i = addr - entry.start
+        shift = (reg.size - 1 - i if reg.endian.is_big else i) * 8
+        mask = (0xFF if bit is None else 1 << bit) << shift
+        return [name for name, prop in reg_fields(reg).items() if prop.mask & mask]
+
+    def range(self, lo: int, hi: int) -> Iterator[RegEntry]:
+        return self.nest.overlap(lo, hi)
+
+    def regions(self, gap: int = 0) -> list[tuple[int, int, list[RegEntry]]]:
+        regions: list[tuple[int, int, list[RegEntry]]] = []
+        for e in self.entries:
+            if regions and e.start <= regions[-1][1] + gap:
+                start, end, entries = regions[-1]
+                entries.append(e)
+                regions[-1] = start, max(end, e.end), entries
+            else:
+                regions.append((e.start, e.end, [e]))
+        return regions
+
+    def issues(self) -> list[Issue]:
+        issues: list[Issue] = []
+        last: RegEntry | None = None
+        for e in self.entries:
+            if e.reg.size <= 0:
+                continue
+            if last is not None and e.start < last.end:
+                issues.append(
+                    Issue(
+                        "overlap",
+                        f"{e.name} [{e.start:#x}, {e.end:#x}) overlaps "
+                        f"{last.name} [{last.start:#x}, {last.end:#x})",
+                        (last, e),
+                    )
+                )
+            if e.start % e.alignment:
+                issues.append(
+                    Issue(
+                        "unaligned",
+                        f"{e.name} at {e.start:#x} is not {e.alignment}-byte aligned",
+                        (e,),
+                    )
+                )
+            if last is None or e.end > last.end:
+                last = e
+        return issues
+
+    def check(self) -> bool:
+        issues = self.issues()
+        for issue in issues:
+            logger.warning(issue.message)
+        return not issues
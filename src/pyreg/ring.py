@@ -0,0 +1,217 @@
+import argparse
+import importlib
+import itertools
+import struct
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Self
+
+from .device import ProxyDevice
+from .endian import ByteT
+from .field import reg_fields
+from .log import logger
+from .record import TraceOp
+from .reg import Reg, RegFlags
+from .regmap import RegMap
+
+RECORD = struct.Struct("<QB3xIQQ")
+HEADER = struct.Struct("<IQdQ")
+MAGIC = b"PYRGRNG1"
+
+
+@dataclass(frozen=True)
+class Entry:
+    time: int
+    op: TraceOp
+    addr: int
+    size: int
+    value: int
+
+
+@dataclass
+class Ring:
+    capacity: int = 1 << 16
+    buf: bytearray = field(init=False, repr=False)
+    count: int = field(default=0, init=False)
+    origin: float = field(default_factory=time.time, init=False)
+    origin_ns: int = field(default_factory=time.perf_counter_ns, init=False)
+
+    _seq: Iterator[int] = field(
+        default_factory=itertools.count, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self.buf = bytearray(self.capacity * RECORD.size)
+
+    def append(self, op: TraceOp, addr: int, data: ByteT) -> None:
+        try:
+            n = next(self._seq)
+            self.count = n + 1
+            RECORD.pack_into(
+                self.buf,
+                n % self.capacity * RECORD.size,
+                time.perf_counter_ns(),
+                op,
+                min(len(data), 0xFFFFFFFF),
+                addr & 0xFFFFFFFFFFFFFFFF,
+                int.from_bytes(data[:8], "little"),
+            )
+        except Exception as e:
+            logger.warning(f"Ring append failed at {addr:#x}: {e!r}")
+
+    def clear(self) -> None:
+        self._seq = itertools.count()
+        self.count = 0
+        self.origin = time.time()
+        self.origin_ns = time.perf_counter_ns()
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def ordered(self) -> bytes:
+        n, count = len(self), self.count
+        if count <= self.capacity:
+            return bytes(self.buf[: n * RECORD.size])
+        i = (count % self.capacity) * RECORD.size
+        return bytes(self.buf[i:] + self.buf[:i])
+
+    def __iter__(self) -> Iterator[Entry]:
+        return iter_entries(self.ordered())
+
+    def dump(self, file: Path | str) -> Path:
+        file = Path(file)
+        data = self.ordered()
+        with file.open(mode="wb") as fp:
+            fp.write(MAGIC)
+            fp.write(HEADER.pack(RECORD.size, self.count, self.origin, self.origin_ns))
+            fp.write(data)
+        logger.info(f"Dump ring: {file} ({len(data) // RECORD.size} records)")
+        return file
+
+
+def iter_entries(data: bytes) -> Iterator[Entry]:
+    for t, op, size, addr, value in RECORD.iter_unpack(data):
+        yield Entry(t, TraceOp(op), addr, size, value)
+
+
+def load(file: Path | str) -> tuple[float, int, list[Entry]]:
+    data = Path(file).read_bytes()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"Not a pyreg ring dump: {file}")
+    size, count, origin, origin_ns = HEADER.unpack_from(data, len(MAGIC))
+    if size != RECORD.size:
+        raise ValueError(f"Unsupported record size {size}")
+    body = data[len(MAGIC) + HEADER.size :]
+    entries = list(iter_entries(body))
+    if count > len(entries):
+        logger.warning(f"Ring wrapped, {count - len(entries)} records lost")
+    return origin, origin_ns, entries
+
+
+@dataclass
+class RingDevice(ProxyDevice):
+    ring: Ring = field(default_factory=Ring, kw_only=True)
+    dump_file: Path | None = field(default=None, kw_only=True)
+
+    def dump_error(self, e: BaseException) -> None:
+        if self.dump_file is None:
+            return
+        logger.error(f"{self.name} failed with {e!r}, dump ring")
+        self.ring.dump(self.dump_file)
+
+    @contextmanager
+    def guard(self) -> Iterator[Self]:
+        try:
+            yield self
+        except Exception as e:
+            self.dump_error(e)
+            raise
+
+    def read(self, addr: int, size: int) -> bytes:
+        with self.guard():
+            b = self.device.read(addr, size)
+        self.ring.append(TraceOp.READ, addr, b)
+        return b
+
+    def write(self, addr: int, val: ByteT) -> None:
+        self.ring.append(TraceOp.WRITE, addr, val)
+        with self.guard():
+            self.device.write(addr, val)
+
+    def burst_read(self, addr: int, size: int) -> bytes:
+        with self.guard():
+            b = self.device.burst_read(addr, size)
+        self.ring.append(TraceOp.BURST_READ, addr, b)
+        return b
+
+    def burst_write(self, addr: int, vals: ByteT) -> None:
+        self.ring.append(TraceOp.BURST_WRITE, addr, vals)
+        with self.guard():
+            self.device.burst_write(addr, vals)
+
+
+@dataclass
+class Decoder:
+    regmap: RegMap
+
+    @classmethod
+    def of(cls, regmaps: Iterable[type[Enum]]) -> Self:
+        return cls(RegMap.of(*regmaps))
+
+    def fields(self, reg: Reg, entry: Entry) -> dict[str, Any]:
+        if entry.addr != reg.addr or entry.size != reg.size or reg.size > 8:
+            return {}
+        b = entry.value.to_bytes(8, "little")[: reg.size]
+        val = reg.endian.bytes_to_int(b)
+        fields: dict[str, Any] = {}
+        if isinstance(reg, RegFlags):
+            fields["flags"] = reg.flag_type(val)
+        for name, prop in reg_fields(reg).items():
+            try:
+                fields[name] = prop.decode(prop.get_field(val))
+            except ValueError:
+                fields[name] = prop.get_field(val)
+        return fields
+
+    def format(self, entry: Entry, origin_ns: int = 0) -> str:
+        t = (entry.time - origin_ns) / 1e3
+        head = f"{t:>14.1f}us {entry.op.name:<11} {entry.addr:#06x} {entry.size:>4}"
+        value = f"{entry.value:#018x}" if entry.size > 8 else f"{entry.value:#x}"
+        found = self.regmap.lookup(entry.addr)
+        if found is None:
+            return f"{head} {value}"
+        name, reg = self.regmap.name(entry.addr), found.reg
+        fields = " ".join(
+            f"{k}={v.name if isinstance(v, Enum) else v}"
+            for k, v in self.fields(reg, entry).items()
+        )
+        return f"{head} {value:<18} {name} {fields}".rstrip()
+
+
+def import_map(path: str) -> type[Enum]:
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="pyreg.ring")
+    parser.add_argument("file", type=Path)
+    parser.add_argument("--map", action="append", default=[], help="module:Enum")
+    parser.add_argument("--tail", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    _, origin_ns, entries = load(args.file)
+    decoder = Decoder.of(import_map(m) for m in args.map)
+    if args.tail is not None:
+        entries = entries[-args.tail :]
+    for entry in entries:
+        print(decoder.format(entry, origin_ns))  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
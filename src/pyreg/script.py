@@ -0,0 +1,193 @@
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Self
+
+from .deferred import coalesce
+from .device import Device, ProxyDevice
+from .endian import ByteT
+from .log import logger
+from .poll import poll
+from .reg import Reg, bind
+
+
+class OpKind(StrEnum):
+    READ = "read"
+    WRITE = "write"
+    BARRIER = "barrier"
+    WAIT = "wait"
+
+
+@dataclass(frozen=True)
+class Op:
+    kind: OpKind
+    addr: int = 0
+    size: int = 0
+    data: bytes = b""
+    mask: bytes = b""
+    timeout: float = 0.0
+
+    def matches(self, b: bytes) -> bool:
+        return all(v & m == d & m for v, m, d in zip(b, self.mask, self.data))
+
+    def run(self, device: Device) -> None:
+        match self.kind:
+            case OpKind.READ:
+                device.read(self.addr, self.size)
+            case OpKind.WRITE:
+                device.write(self.addr, self.data)
+                if (shadow := device.shadow) is not None:
+                    shadow.invalidate(self.addr, self.size)
+            case OpKind.BARRIER:
+                device.barrier()
+            case OpKind.WAIT:
+                poll(
+                    lambda: self.matches(device.read(self.addr, self.size)),
+                    self.timeout,
+                )
+
+    def to_json(self) -> dict[str, Any]:
+        d: dict[str, Any] = {
+            "op": self.kind,
+            "addr": self.addr,
+            "size": self.size,
+            "data": self.data.hex(),
+        }
+        if self.kind is OpKind.WAIT:
+            d |= {"mask": self.mask.hex(), "timeout": self.timeout}
+        return d
+
+    @classmethod
+    def from_json(cls, d: dict[str, Any]) -> Self:
+        return cls(
+            OpKind(d["op"]),
+            d["addr"],
+            d["size"],
+            bytes.fromhex(d["data"]),
+            bytes.fromhex(d.get("mask", "")),
+            d.get("timeout", 0.0),
+        )
+
+
+@dataclass
+class Plan:
+    ops: list[Op] = field(default_factory=list[Op])
+
+    @classmethod
+    def compile(cls, ops: Iterable[Op]) -> Self:
+        plan = cls()
+        pending: dict[int, int] = {}
+
+        def flush() -> None:
+            for addr, b in coalesce(pending):
+                plan.ops.append(Op(OpKind.WRITE, addr, len(b), b))
+            pending.clear()
+
+        for op in ops:
+            if op.kind is OpKind.WRITE:
+                for i, v in enumerate(op.data):
+                    pending[op.addr + i] = v
+                continue
+            flush()
+            if plan.ops and plan.ops[-1] == op:
+                continue
+            plan.ops.append(op)
+        flush()
+        return plan
+
+    @property
+    def writes(self) -> int:
+        return sum(op.kind is OpKind.WRITE for op in self.ops)
+
+    def run(self, device: Device) -> None:
+        for op in self.ops:
+            op.run(device)
+
+    def save(self, file: Path) -> None:
+        with file.open(mode="w") as fp:
+            json.dump([op.to_json() for op in self.ops], fp, indent=1)
+
+    @classmethod
+    def load(cls, file: Path) -> Self:
+        with file.open(mode="r") as fp:
+            return cls([Op.from_json(d) for d in json.load(fp)])
+
+
+@dataclass
+class Recorder(ProxyDevice):
+    volatile: set[int] = field(default_factory=set[int], kw_only=True)
+    passthrough: bool = field(default=False, kw_only=True)
+    ops: list[Op] = field(default_factory=list[Op], init=False)
+    image: dict[int, int] = field(default_factory=dict[int, int], init=False)
+    polled: set[int] = field(default_factory=set[int], init=False)
+
+    def waiting(self, addr: int, size: int) -> bool:
+        last = self.ops[-1] if self.ops else None
+        return (
+            last is not None
+            and last.kind is OpKind.WAIT
+            and (last.addr, last.size) == (addr, size)
+        )
+
+    def read(self, addr: int, size: int) -> bytes:
+        span = range(addr, addr + size)
+        if all(a in self.image and a not in self.volatile for a in span):
+            return bytes(self.image[a] for a in span)
+        op = Op(OpKind.READ, addr, size)
+        if not self.waiting(addr, size):
+            if self.ops and self.ops[-1] == op and addr in self.volatile:
+                self.polled.add(addr)
+            self.ops.append(op)
+        b = bytearray(self.device.read(addr, size))
+        for i in range(size):
+            a = addr + i
+            if a not in self.volatile and (v := self.image.get(a)) is not None:
+                b[i] = v
+        return bytes(b)
+
+    def burst_read(self, addr: int, size: int) -> bytes:
+        return self.read(addr, size)
+
+    def write(self, addr: int, val: ByteT) -> None:
+        b = bytes(val)
+        self.ops.append(Op(OpKind.WRITE, addr, len(b), b))
+        for i, v in enumerate(b):
+            self.image[addr + i] = v
+        if self.passthrough:
+            self.device.write(addr, b)
+            if (shadow := self.device.shadow) is not None:
+                shadow.invalidate(addr, len(b))
+
+    def burst_write(self, addr: int, vals: ByteT) -> None:
+        self.write(addr, vals)
+
+    def barrier(self) -> None:
+        self.ops.append(Op(OpKind.BARRIER))
+        if self.passthrough:
+            self.device.barrier()
+
+    def expect(self, addr: int, mask: bytes, value: bytes, timeout: float) -> None:
+        self.ops.append(Op(OpKind.WAIT, addr, len(value), value, mask, timeout))
+
+    def compile(self) -> Plan:
+        if self.polled:
+            addrs = ", ".join(f"{a:#x}" for a in sorted(self.polled))
+            raise ValueError(f"Polled reads at {addrs} cannot be replayed")
+        plan = Plan.compile(self.ops)
+        logger.debug(f"Compiled {len(self.ops)} ops into {len(plan.ops)}")
+        return plan
+
+
+@contextmanager
+def record(
+    regs: Iterable[Reg], device: Device, passthrough: bool = False
+) -> Iterator[Recorder]:
+    regs = list(regs)
+    volatile = {
+        a for reg in regs if reg.volatile for a in range(reg.addr, reg.addr + reg.size)
+    }
+    recorder = Recorder(device=device, volatile=volatile, passthrough=passthrough)
+    with bind(regs, recorder):
+        yield recorder
@@ -0,0 +1,157 @@
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, ClassVar, Iterator
+
+from .bit import Bytes
+from .device import Device
+from .endian import ByteT
+from .field import TrgProperty, reg_fields
+from .reg import Reg
+
+type SimHook = Callable[["SimDevice", int], None]
+
+
+@dataclass
+class SimDevice(Device):
+    PAGE: ClassVar[int] = Bytes._4K
+
+    name: str = "SIM"
+    latency: float = 0.0
+    byte_latency: float = 0.0
+    fill: int = 0x00
+
+    pages: dict[int, bytearray] = field(default_factory=dict[int, bytearray])
+    ro: dict[int, int] = field(default_factory=dict[int, int], repr=False)
+    w1c: dict[int, int] = field(default_factory=dict[int, int], repr=False)
+    sc: dict[int, int] = field(default_factory=dict[int, int], repr=False)
+    hooks: list[tuple[Reg, int, float, SimHook]] = field(
+        default_factory=list[tuple[Reg, int, float, SimHook]], repr=False
+    )
+    timers: list[tuple[float, int, SimHook, int]] = field(
+        default_factory=list[tuple[float, int, SimHook, int]], repr=False
+    )
+    transactions: int = 0
+    seq: Iterator[int] = field(default_factory=itertools.count, repr=False)
+
+    def peek_bytes(self, addr: int, size: int) -> bytes:
+        b = bytearray()
+        while size > 0:
+            p, off = divmod(addr, self.PAGE)
+            n = min(size, self.PAGE - off)
+            page = self.pages.get(p)
+            b += page[off : off + n] if page is not None else bytes([self.fill]) * n
+            addr += n
+            size -= n
+        return bytes(b)
+
+    def poke_bytes(self, addr: int, val: ByteT) -> None:
+        val = bytes(val)
+        pos = 0
+        while pos < len(val):
+            p, off = divmod(addr + pos, self.PAGE)
+            n = min(len(val) - pos, self.PAGE - off)
+            page = self.pages.get(p)
+            if page is None:
+                page = self.pages[p] = bytearray([self.fill]) * self.PAGE
+            page[off : off + n] = val[pos : pos + n]
+            pos += n
+
+    def peek(self, reg: Reg) -> int:
+        return reg.endian.bytes_to_int(self.peek_bytes(reg.addr, reg.size))
+
+    def poke(self, reg: Reg, val: int) -> None:
+        self.poke_bytes(reg.addr, reg.endian.int_to_bytes(val, reg.size))
+
+    def set_bits(self, reg: Reg, mask: int) -> None:
+        self.poke(reg, self.peek(reg) | mask)
+
+    def clear_bits(self, reg: Reg, mask: int) -> None:
+        self.poke(reg, self.peek(reg) & ~mask)
+
+    def declare_mask(self, table: dict[int, int], reg: Reg, mask: int) -> None:
+        for i, m in enumerate(reg.endian.int_to_bytes(mask, reg.size)):
+            if m:
+                table[reg.addr + i] = table.get(reg.addr + i, 0) | m
+
+    def read_only(self, reg: Reg, mask: int | None = None) -> None:
+        self.declare_mask(self.ro, reg, reg.full_mask if mask is None else mask)
+
+    def write_1_to_clear(self, reg: Reg, mask: int) -> None:
+        self.declare_mask(self.w1c, reg, mask)
+
+    def self_clearing(self, reg: Reg, mask: int) -> None:
+        self.declare_mask(self.sc, reg, mask)
+
+    def on_write(
+        self, reg: Reg, hook: SimHook, mask: int | None = None, delay: float = 0.0
+    ) -> None:
+        self.hooks.append((reg, reg.full_mask if mask is None else mask, delay, hook))
+
+    def declare(self, reg: Reg) -> None:
+        if not reg.mode.is_writable:
+            self.read_only(reg)
+        for prop in reg_fields(reg).values():
+            if isinstance(prop, TrgProperty):
+                self.self_clearing(reg, prop.mask)
+
+    def declare_map(self, regmap: type[Enum]) -> None:
+        for member in regmap:
+            self.declare(member.value)
+
+    def tick(self) -> None:
+        self.transactions += 1
+        now = time.monotonic()
+        while self.timers and self.timers[0][0] <= now:
+            _, _, hook, val = heapq.heappop(self.timers)
+            hook(self, val)
+
+    def wait(self, size: int) -> None:
+        delay = self.latency + self.byte_latency * size
+        if delay:
+            time.sleep(delay)
+
+    def read(self, addr: int, size: int) -> bytes:
+        self.wait(size)
+        self.tick()
+        return self.peek_bytes(addr, size)
+
+    def write(self, addr: int, val: ByteT) -> None:
+        self.wait(len(val))
+        self.tick()
+        old = self.peek_bytes(addr, len(val))
+        new = bytearray(val)
+        for i, v in enumerate(new):
+            a = addr + i
+            if m := self.ro.get(a):
+                v = (v & ~m) | (old[i] & m)
+            if m := self.w1c.get(a):
+                v = (v & ~m) | (old[i] & ~new[i] & m)
+            if m := self.sc.get(a):
+                v &= ~m
+            new[i] = v & 0xFF
+        self.poke_bytes(addr, new)
+
+        for reg, mask, delay, hook in self.hooks:
+            if not (reg.addr < addr + len(val) and addr < reg.addr + reg.size):
+                continue
+            lo = max(addr, reg.addr)
+            hi = min(addr + len(val), reg.addr + reg.size)
+            b = bytearray(self.peek_bytes(reg.addr, reg.size))
+            b[lo - reg.addr : hi - reg.addr] = bytes(val)[lo - addr : hi - addr]
+            written = reg.endian.bytes_to_int(b)
+            if not written & mask:
+                continue
+            if delay:
+                due = time.monotonic() + delay
+                heapq.heappush(self.timers, (due, next(self.seq), hook, written))
+            else:
+                hook(self, written)
+
+    def burst_read(self, addr: int, size: int) -> bytes:
+        return self.read(addr, size)
+
+    def burst_write(self, addr: int, vals: ByteT) -> None:
+        return self.write(addr, vals)
@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Self
+
+from .device import Device
+from .log import logger
+from .probe import Probe, Span, install, uninstall
+from .reg import Reg
+
+
+@dataclass
+class Tracer(Probe):
+    names: dict[int, str] = field(default_factory=dict[int, str])
+    max_events: int = 1_000_000
+    events: list[dict[str, Any]] = field(default_factory=list[dict[str, Any]])
+    dropped: int = 0
+    origin: int = field(default_factory=time.perf_counter_ns)
+
+    _threads: dict[int, str] = field(default_factory=dict[int, str], repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add_names(self, regmap: type[Enum]) -> Self:
+        for m in regmap:
+            if isinstance(m.value, Reg):
+                self.names.setdefault(m.value.addr, m.name)
+        return self
+
+    def label(self, target: Any) -> str:
+        if isinstance(target, Reg):
+            return self.names.get(target.addr) or f"{target.addr:#06x}"
+        if isinstance(target, Enum):
+            return f"{type(target).__name__}.{target.name}"
+        if isinstance(target, Device):
+            return target.name
+        return type(target).__name__
+
+    def args(self, span: Span) -> dict[str, Any]:
+        target = span.target
+        if isinstance(target, Reg):
+            args: dict[str, Any] = {"addr": f"{target.addr:#06x}"}
+        elif isinstance(target, Device) and span.args:
+            addr, arg = span.args[0], span.args[1] if len(span.args) > 1 else None
+            size = arg if isinstance(arg, int) else len(arg) if arg is not None else 0
+            args = {"addr": f"{addr:#06x}", "size": size}
+        else:
+            args = {}
+        if span.error is not None:
+            args["error"] = repr(span.error)
+        return args
+
+    def exit(self, span: Span) -> None:
+        name = self.label(span.target)
+        if span.field is not None:
+            name = f"{name}.{span.field}"
+        tid = threading.get_ident()
+        event = {
+            "name": f"{name} {span.op}",
+            "cat": type(span.target).__name__,
+            "ph": "X",
+            "ts": (span.start - self.origin) / 1e3,
+            "dur": span.elapsed / 1e3,
+            "pid": os.getpid(),
+            "tid": tid,
+            "args": self.args(span),
+        }
+        with self._lock:
+            if len(self.events) >= self.max_events:
+                self.dropped += 1
+                return
+            self.events.append(event)
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+
+    def start(self) -> Self:
+        install(self)
+        return self
+
+    def stop(self) -> None:
+        uninstall(self)
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.events.clear()
+            self._threads.clear()
+            self.dropped = 0
+            self.origin = time.perf_counter_ns()
+
+    def to_dict(self) -> dict[str, Any]:
+        pid = os.getpid()
+        with self._lock:
+            meta = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self._threads.items()
+            ]
+            events = sorted(self.events, key=lambda e: e["ts"])
+        return {
+            "traceEvents": meta + events,
+            "displayTimeUnit": "ns",
+            "otherData": {"dropped": self.dropped},
+        }
+
+    def save(self, file: Path | str) -> Path:
+        file = Path(file)
+        file.write_text(json.dumps(self.to_dict()))
+        logger.info(f"Save trace: {file} ({len(self.events)} events)")
+        if self.dropped:
+            logger.warning(f"Trace dropped {self.dropped} events")
+        return file
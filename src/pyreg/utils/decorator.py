@@ -3,6 +3,8 @@ import warnings
 from functools import wraps
 from typing import Callable
 
+from ..poll import Backoff, poll
+
 
 def deprecated(func):
     @wraps(func)
@@ -32,12 +34,11 @@ def timeout_check(timeout: float = 5.0, delay: float = 0.05):
     def decorator(func: Callable[[], bool]):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            max_retries = int(timeout / delay)
-            for _ in range(max_retries):
-                if func(*args, **kwargs):
-                    return True
-                time.sleep(delay)
-            return False
+            try:
+                poll(lambda: func(*args, **kwargs), timeout, Backoff.fixed(delay))
+            except TimeoutError:
+                return False
+            return True
 
         return wrapper
 
@@ -6,6 +6,7 @@ from pathlib import Path
 
 from loguru import logger
 
+from .. import log
 from . import decorator, plat
 
 if typing.TYPE_CHECKING:
@@ -57,6 +58,8 @@ class Logger:
             self.file = self.dir.joinpath(f"{plat.time_stamp()}_{self.filename}.log")
             logger.add(self.file, format=custom_format, level=self.level)
 
+        log.logger.set_level(self.level, sink=False)
+
         logger.trace("This is TRACE")
         logger.debug("This is DEBUG")
         logger.info("This is INFO")
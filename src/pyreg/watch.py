@@ -0,0 +1,140 @@
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Callable, Iterable, Self
+
+from .field import reg_fields
+from .log import logger
+from .mask import BitMask
+from .plan import read_regs
+from .reg import Reg
+
+
+@dataclass(frozen=True)
+class Change:
+    reg: Reg
+    field: str | None
+    old: int
+    new: int
+
+    def __repr__(self) -> str:
+        name = f"{self.reg.addr:#x}" + (f".{self.field}" if self.field else "")
+        return f"Change({name}: {self.old:#x} -> {self.new:#x})"
+
+
+type ChangeCallback = Callable[[Change], None]
+
+
+@dataclass
+class Watch:
+    reg: Reg
+    callback: ChangeCallback
+    fields: dict[str, BitMask]
+
+    def diff(self, old: int, new: int) -> list[Change]:
+        if not self.fields:
+            return [Change(self.reg, None, old, new)]
+        changes: list[Change] = []
+        for name, bm in self.fields.items():
+            o, n = bm.get_field(old), bm.get_field(new)
+            if o != n:
+                changes.append(Change(self.reg, name, o, n))
+        return changes
+
+
+@dataclass
+class Watcher:
+    interval: float = 0.1
+    gap: int = 0x80
+    watches: list[Watch] = field(default_factory=list[Watch])
+    last: dict[int, int] = field(default_factory=dict[int, int])
+    cycles: int = 0
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, repr=False)
+    _thread: threading.Thread | None = field(default=None, repr=False)
+
+    def subscribe(
+        self,
+        reg: Reg,
+        callback: ChangeCallback,
+        fields: Iterable[str] | None = None,
+    ) -> Watch:
+        reg.check_read()
+        if reg.size <= 0:
+            raise ValueError(f"Cannot watch empty Reg {reg.addr:#x}")
+        all_fields: dict[str, BitMask] = dict(reg_fields(reg))
+        if fields is not None:
+            all_fields = {name: all_fields[name] for name in fields}
+        watch = Watch(reg, callback, all_fields)
+        with self._lock:
+            self.watches.append(watch)
+        return watch
+
+    def unsubscribe(self, watch: Watch) -> None:
+        with self._lock:
+            self.watches.remove(watch)
+            if not any(w.reg is watch.reg for w in self.watches):
+                self.last.pop(id(watch.reg), None)
+
+    def poll(self) -> None:
+        with self._lock:
+            watches = list(self.watches)
+        regs = {id(w.reg): w.reg for w in watches}
+        vals = {id(reg): val for reg, val in read_regs(regs.values(), self.gap)}
+        self.cycles += 1
+
+        for w in watches:
+            new = vals[id(w.reg)]
+            old = self.last.get(id(w.reg))
+            if old is None or old == new:
+                continue
+            for change in w.diff(old, new):
+                try:
+                    w.callback(change)
+                except Exception as e:
+                    logger.error(f"Watch callback failed for {change!r}: {e!r}")
+        self.last.update(vals)
+
+    def safe_poll(self) -> None:
+        try:
+            self.poll()
+        except Exception as e:
+            logger.error(f"Watcher poll failed: {e!r}")
+
+    def run(self) -> None:
+        while True:
+            self.safe_poll()
+            if self._stop.wait(self.interval):
+                return
+
+    async def run_async(self) -> None:
+        while not self._stop.is_set():
+            await asyncio.to_thread(self.safe_poll)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="Watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.stop()